@@ -9,6 +9,28 @@ class Settings:
     # Base de dados
     DATABASE_PATH: str = os.getenv("DATABASE_PATH", "sports_league.sqlite")
     
+    # Épocas: diretório com uma base de dados por época (<época>.sqlite)
+    # Se vazio, DATABASE_PATH é usado como única época (DEFAULT_SEASON)
+    SEASONS_DIR: str = os.getenv("SEASONS_DIR", "")
+    DEFAULT_SEASON: str = os.getenv("DEFAULT_SEASON", "2023-2024")
+    SHARD_WORKERS: int = int(os.getenv("SHARD_WORKERS", "4"))
+    # Criar índices no arranque da API (escreve no ficheiro; por omissão usar `python -m app.indexes`)
+    CREATE_INDEXES: bool = os.getenv("CREATE_INDEXES", "false").lower() == "true"
+    
+    # Memória: orçamento global das caches e limite da cache de queries de cada época (MB)
+    MEMORY_BUDGET_MB: float = float(os.getenv("MEMORY_BUDGET_MB", "128"))
+    QUERY_CACHE_MB: float = float(os.getenv("QUERY_CACHE_MB", "32"))
+    INDEX_CACHE_MB: float = float(os.getenv("INDEX_CACHE_MB", "64"))
+    # Número de frames guardados pelo tracemalloc (0 = desativado)
+    TRACEMALLOC_FRAMES: int = int(os.getenv("TRACEMALLOC_FRAMES", "0"))
+    # Endpoints de administração (/api/v1/admin)
+    ENABLE_ADMIN: bool = os.getenv("ENABLE_ADMIN", "false").lower() == "true"
+    # Intervalo (segundos) entre verificações da versão dos dados de cada época
+    DATASET_VERSION_TTL: float = float(os.getenv("DATASET_VERSION_TTL", "5"))
+    
+    # Ingestão
+    INGEST_BATCH_SIZE: int = int(os.getenv("INGEST_BATCH_SIZE", "1000"))
+    
     # CORS
     ALLOWED_ORIGINS: List[str] = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000").split(",")
     
@@ -1,30 +1,230 @@
 import sqlite3
-from typing import Dict, List, Any
+import glob
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Union
+from app.config import settings
+from app.logging_config import logger
+from app.memory import ByteLRUCache, MB, budget
 
-DATABASE_PATH = "sports_league.sqlite"
+DATABASE_PATH = settings.DATABASE_PATH
 
-def get_db_connection():
-    """Cria uma conexão à base de dados SQLite"""
-    if not os.path.exists(DATABASE_PATH):
-        raise FileNotFoundError(f"Base de dados não encontrada: {DATABASE_PATH}")
-    
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row  # Permite acesso por nome de coluna
-    return conn
+# Índices criados em cada shard (as tabelas originais não têm chaves nem índices)
+SHARD_INDEXES = {
+    "idx_leagues_id": "leagues(league_id)",
+    "idx_teams_id": "teams(team_id)",
+    "idx_teams_league": "teams(league_id, name)",
+    "idx_matches_id": "matches(match_id)",
+    "idx_matches_league_date": "matches(league_id, utc_date)",
+    "idx_matches_date": "matches(utc_date)",
+    "idx_matches_home_team": "matches(home_team_id)",
+    "idx_matches_away_team": "matches(away_team_id)",
+    "idx_scores_match": "scores(match_id)",
+    "idx_players_id": "players(player_id)",
+    "idx_players_team": "players(team_id)",
+    "idx_players_nationality": "players(nationality)",
+    "idx_players_position": "players(position)",
+    "idx_players_birth": "players(date_of_birth)",
+    "idx_standings_league": "standings(league_id, position)",
+    "idx_standings_team": "standings(team_id)",
+}
 
-def execute_query(query: str, params: tuple = ()) -> List[Dict[str, Any]]:
+
+class SeasonNotFoundError(LookupError):
+    """Época pedida não existe em nenhum shard"""
+
+
+class Shard:
+    """Base de dados SQLite de uma época, com cache própria de resultados"""
+
+    def __init__(self, season: str, path: str):
+        self.season = season
+        self.path = path
+        self._cache = ByteLRUCache(f"queries:{season}", int(settings.QUERY_CACHE_MB * MB))
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._version_checked = 0.0
+
+    def connect(self) -> sqlite3.Connection:
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"Base de dados não encontrada: {self.path}")
+
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row  # Permite acesso por nome de coluna
+        return conn
+
+    @property
+    def version(self) -> int:
+        """Versão dos dados (`PRAGMA user_version`), verificada no máximo a cada DATASET_VERSION_TTL segundos"""
+        if self._version is None or time.monotonic() - self._version_checked >= settings.DATASET_VERSION_TTL:
+            self.refresh_version()
+        return self._version
+
+    def refresh_version(self) -> int:
+        """Lê a versão dos dados e descarta a cache se tiver mudado (ex: depois de uma ingestão)"""
+        with self.connect() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+        with self._lock:
+            if version != self._version:
+                self._cache.clear()
+            self._version = version
+            self._version_checked = time.monotonic()
+        return version
+
+    def query(self, query: str, params: tuple = (), cache: bool = True) -> List[Dict[str, Any]]:
+        """Executa uma query no shard, reutilizando resultados em cache (não alterar as linhas devolvidas)"""
+        key = (self.version, query, params)
+        rows = self._cache.get(key) if cache else None
+        if rows is not None:
+            return rows
+
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            rows = [dict(row) for row in cursor.fetchall()]
+
+        if cache:
+            self._cache.put(key, rows)
+        return rows
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+    def close(self) -> None:
+        """Liberta a cache do shard (deixa de contar para o orçamento de memória)"""
+        self._cache.clear()
+        budget.unregister(self._cache)
+
+    def ensure_indexes(self) -> None:
+        """Cria os índices do shard (escreve no ficheiro da base de dados)"""
+        with sqlite3.connect(self.path) as conn:
+            for name, target in SHARD_INDEXES.items():
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+    def missing_indexes(self) -> List[str]:
+        """Índices de SHARD_INDEXES que ainda não existem no shard"""
+        with self.connect() as conn:
+            existing = {row["name"] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        return [name for name in SHARD_INDEXES if name not in existing]
+
+
+_shards: Optional[Dict[str, Shard]] = None
+_shards_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=settings.SHARD_WORKERS, thread_name_prefix="shard")
+
+
+def discover_shards() -> Dict[str, Shard]:
+    """Encontra as bases de dados por época (`<SEASONS_DIR>/<época>.sqlite`) ou usa DATABASE_PATH"""
+    if settings.SEASONS_DIR:
+        shards = {}
+        for path in sorted(glob.glob(os.path.join(settings.SEASONS_DIR, "*.sqlite"))):
+            season = os.path.splitext(os.path.basename(path))[0]
+            shards[season] = Shard(season, path)
+        return shards
+    return {settings.DEFAULT_SEASON: Shard(settings.DEFAULT_SEASON, DATABASE_PATH)}
+
+
+def get_shards() -> Dict[str, Shard]:
+    """Shards disponíveis, ordenados por época"""
+    global _shards
+    if _shards is None:
+        with _shards_lock:
+            if _shards is None:
+                _shards = discover_shards()
+    return _shards
+
+
+def reload_shards() -> Dict[str, Shard]:
+    """Volta a procurar os shards (ex: depois de adicionar uma nova época)"""
+    global _shards
+    with _shards_lock:
+        for shard in (_shards or {}).values():
+            shard.close()
+        _shards = discover_shards()
+    return _shards
+
+
+def init_shards() -> None:
+    """Verifica os shards no arranque da API (os índices são criados com `python -m app.indexes`)"""
+    shards = get_shards()
+    if not shards:
+        raise FileNotFoundError(f"Nenhuma base de dados encontrada em '{settings.SEASONS_DIR}'")
+    for shard in shards.values():
+        if not os.path.exists(shard.path):
+            raise FileNotFoundError(f"Base de dados '{shard.path}' não encontrada")
+        if settings.CREATE_INDEXES:
+            try:
+                shard.ensure_indexes()
+            except sqlite3.OperationalError as e:
+                logger.warning(f"Não foi possível criar índices em {shard.path}: {e}")
+        missing = shard.missing_indexes()
+        if missing:
+            logger.warning(
+                f"Época {shard.season} sem {len(missing)} índices ({shard.path}); "
+                f"executar 'python -m app.indexes --season {shard.season}'"
+            )
+
+
+def list_seasons() -> List[str]:
+    return list(get_shards())
+
+
+def default_season() -> str:
+    """Época usada quando o pedido não indica nenhuma (DEFAULT_SEASON ou a mais recente)"""
+    shards = get_shards()
+    if settings.DEFAULT_SEASON in shards:
+        return settings.DEFAULT_SEASON
+    if not shards:
+        raise SeasonNotFoundError("Nenhuma época disponível")
+    return max(shards)
+
+
+def get_shard(season: Optional[str] = None) -> Shard:
+    shards = get_shards()
+    season = season or default_season()
+    if season not in shards:
+        raise SeasonNotFoundError(season)
+    return shards[season]
+
+
+def get_db_connection(season: Optional[str] = None):
+    """Cria uma conexão à base de dados SQLite da época indicada"""
+    return get_shard(season).connect()
+
+
+def execute_query(query: str, params: tuple = (), season: Optional[str] = None) -> List[Dict[str, Any]]:
     """Executa uma query e retorna os resultados como lista de dicionários"""
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        return [dict(row) for row in rows]
+    return get_shard(season).query(query, params)
+
 
-def execute_single_query(query: str, params: tuple = ()) -> Dict[str, Any] | None:
+def execute_single_query(query: str, params: tuple = (), season: Optional[str] = None) -> Dict[str, Any] | None:
     """Executa uma query e retorna um único resultado"""
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        row = cursor.fetchone()
-        return dict(row) if row else None 
\ No newline at end of file
+    rows = get_shard(season).query(query, params)
+    return rows[0] if rows else None
+
+
+def execute_query_seasons(query: str, params: Union[tuple, Dict[str, tuple]], seasons: List[str]) -> List[Dict[str, Any]]:
+    """Executa a query em várias épocas em paralelo e junta os resultados, indicando a época de cada linha.
+
+    `params` pode ser comum a todas as épocas ou um dicionário época -> parâmetros.
+    """
+    shards = [get_shard(season) for season in seasons]
+
+    def run(shard: Shard):
+        shard_params = params[shard.season] if isinstance(params, dict) else params
+        return shard.season, shard.query(query, shard_params)
+
+    results = _executor.map(run, shards)
+    return [{**row, "season": season} for season, rows in results for row in rows]
+
+
+def dataset_versions() -> Dict[str, int]:
+    """Versão dos dados de cada época"""
+    return {season: shard.version for season, shard in get_shards().items()}
+
+
+def clear_caches() -> None:
+    for shard in get_shards().values():
+        shard.clear_cache()
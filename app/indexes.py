@@ -0,0 +1,36 @@
+"""
+Criação dos índices das bases de dados por época.
+
+Escreve nos ficheiros SQLite, por isso é um passo explícito (antes do deploy ou depois de
+adicionar uma época) e não acontece no arranque da API, onde as bases de dados podem estar
+montadas só de leitura.
+
+Uso:
+    python -m app.indexes [--season 2023-2024]
+"""
+import argparse
+from typing import List, Optional
+
+from app.database import get_shard, get_shards
+from app.logging_config import logger
+
+
+def create_indexes(season: Optional[str] = None) -> List[str]:
+    """Cria os índices de uma época (ou de todas) e devolve as épocas processadas"""
+    shards = [get_shard(season)] if season else list(get_shards().values())
+    for shard in shards:
+        missing = shard.missing_indexes()
+        shard.ensure_indexes()
+        logger.info(f"Índices da época {shard.season} ({shard.path}): {len(missing)} criados")
+    return [shard.season for shard in shards]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Criar os índices das bases de dados por época")
+    parser.add_argument("--season", help="Época a indexar (por omissão todas)")
+    args = parser.parse_args(argv)
+    create_indexes(args.season)
+
+
+if __name__ == "__main__":
+    main()
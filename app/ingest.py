@@ -0,0 +1,394 @@
+"""
+Ingestão de resultados para a base de dados de uma época.
+
+Carrega jogos, resultados, jogadores e classificações a partir de ficheiros CSV ou JSON,
+numa única transação em modo WAL (os leitores da API nunca ficam bloqueados), atualiza
+apenas as classificações das equipas afetadas e publica uma nova versão dos dados
+(`PRAGMA user_version`), usada pelas caches para se invalidarem.
+
+Uso:
+    python -m app.ingest --season 2023-2024 --matches jogos.csv --scores resultados.json
+"""
+import argparse
+import csv
+import json
+import os
+import sqlite3
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Type
+
+from pydantic import BaseModel
+
+from app.config import settings
+from app.database import get_shard
+from app.logging_config import logger
+from app.models import Match, Player, Score, Standing
+
+# Tabela -> (modelo, colunas que identificam um registo existente)
+TABLES: Dict[str, Tuple[Type[BaseModel], Tuple[str, ...]]] = {
+    "matches": (Match, ("match_id",)),
+    "scores": (Score, ("match_id",)),
+    "players": (Player, ("player_id",)),
+    "standings": (Standing, ("league_id", "team_id")),
+}
+
+# Número de jogos usados no campo `form` da classificação
+FORM_LENGTH = 5
+
+
+def load_records(path: str) -> List[Dict[str, Any]]:
+    """Lê registos de um ficheiro CSV ou JSON (lista de objetos)"""
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, encoding="utf-8", newline="") as f:
+        if extension == ".csv":
+            # Células vazias do CSV correspondem a NULL
+            return [{k: (v if v != "" else None) for k, v in row.items()} for row in csv.DictReader(f)]
+        if extension == ".json":
+            records = json.load(f)
+            if not isinstance(records, list):
+                raise ValueError(f"O ficheiro JSON deve conter uma lista de registos: {path}")
+            return records
+    raise ValueError(f"Formato não suportado (usar .csv ou .json): {path}")
+
+
+def _validate(table: str, records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Valida os registos com o modelo da tabela, mantendo apenas as colunas fornecidas.
+
+    Registos repetidos (mesma chave) são juntos, prevalecendo os valores do último.
+    """
+    model, key_columns = TABLES[table]
+    rows: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+    for record in records:
+        values = model.model_validate(record).model_dump(exclude_unset=True)
+        key = tuple(values.get(c) for c in key_columns)
+        if None in key:
+            raise ValueError(f"Registo de {table} sem {', '.join(key_columns)}: {record}")
+        row = {c: v.isoformat() if isinstance(v, date) else v for c, v in values.items()}
+        rows[key] = {**rows.get(key, {}), **row}
+    return list(rows.values())
+
+
+def _column(rows: List[Dict[str, Any]], column: str) -> Set[Any]:
+    """Valores distintos de uma coluna nos registos validados"""
+    return {row[column] for row in rows if row.get(column) is not None}
+
+
+def _batches(rows: List[Any], size: int) -> Iterable[List[Any]]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _existing_keys(
+    conn: sqlite3.Connection, table: str, key_columns: Tuple[str, ...], keys: List[Tuple[Any, ...]]
+) -> Set[Tuple[Any, ...]]:
+    """Chaves de `keys` que já existem na tabela"""
+    columns = ", ".join(key_columns)
+    placeholders = ", ".join(f"({', '.join('?' for _ in key_columns)})" for _ in keys)
+    rows = conn.execute(
+        f"SELECT {columns} FROM {table} WHERE ({columns}) IN (VALUES {placeholders})",
+        [value for key in keys for value in key],
+    ).fetchall()
+    return {tuple(row) for row in rows}
+
+
+def _upsert(conn: sqlite3.Connection, table: str, rows: List[Dict[str, Any]]) -> None:
+    """Atualiza só as colunas fornecidas dos registos existentes (as tabelas não têm chave
+    primária) e insere os novos; colunas omitidas mantêm o valor guardado"""
+    _, key_columns = TABLES[table]
+
+    # Registos com as mesmas colunas são escritos em conjunto (executemany)
+    groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(tuple(row), []).append(row)
+
+    for columns, group in groups.items():
+        values = [c for c in columns if c not in key_columns]
+        update_sql = (
+            f"UPDATE {table} SET {', '.join(f'{c} = ?' for c in values)} "
+            f"WHERE {' AND '.join(f'{c} = ?' for c in key_columns)}"
+        )
+        insert_sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+
+        for batch in _batches(group, settings.INGEST_BATCH_SIZE):
+            existing = _existing_keys(conn, table, key_columns, [tuple(row[c] for c in key_columns) for row in batch])
+            updates = [row for row in batch if tuple(row[c] for c in key_columns) in existing]
+            inserts = [row for row in batch if tuple(row[c] for c in key_columns) not in existing]
+            if values and updates:
+                conn.executemany(update_sql, [tuple(row[c] for c in values + list(key_columns)) for row in updates])
+            if inserts:
+                conn.executemany(insert_sql, [tuple(row[c] for c in columns) for row in inserts])
+
+
+def _update_winners(conn: sqlite3.Connection, match_ids: Set[int]) -> None:
+    """Atualiza o vencedor dos jogos afetados a partir do resultado final (se existir)"""
+    conn.executemany(
+        """
+        UPDATE matches SET winner = COALESCE((
+            SELECT CASE
+                WHEN s.full_time_home > s.full_time_away THEN 'HOME_TEAM'
+                WHEN s.full_time_home < s.full_time_away THEN 'AWAY_TEAM'
+                ELSE 'DRAW' END
+            FROM scores s
+            WHERE s.match_id = matches.match_id AND s.full_time_home IS NOT NULL
+        ), winner)
+        WHERE match_id = ?
+        """,
+        [(match_id,) for match_id in match_ids],
+    )
+
+
+def _team_results(conn: sqlite3.Connection, team_id: int, league_id: int) -> List[Tuple[int, str, int, int]]:
+    """Resultados da equipa na liga por ordem cronológica: (match_id, W/D/L, golos marcados, sofridos)"""
+    rows = conn.execute(
+        """
+        SELECT m.match_id, m.home_team_id, m.winner, s.full_time_home, s.full_time_away
+        FROM matches m
+        JOIN scores s ON m.match_id = s.match_id
+        WHERE (m.home_team_id = ? OR m.away_team_id = ?) AND m.league_id = ? AND m.winner IS NOT NULL
+        ORDER BY m.utc_date, m.match_id
+        """,
+        (team_id, team_id, league_id),
+    ).fetchall()
+
+    results = []
+    for match_id, home_team_id, winner, home_goals, away_goals in rows:
+        is_home = home_team_id == team_id
+        if winner == "DRAW":
+            result = "D"
+        elif (winner == "HOME_TEAM") == is_home:
+            result = "W"
+        else:
+            result = "L"
+        results.append((
+            match_id,
+            result,
+            (home_goals if is_home else away_goals) or 0,
+            (away_goals if is_home else home_goals) or 0,
+        ))
+    return results
+
+
+def _aggregate(results: List[Tuple[int, str, int, int]]) -> Dict[str, int]:
+    """Agregados numéricos da classificação calculados a partir dos resultados"""
+    won = sum(1 for _, result, _, _ in results if result == "W")
+    draw = sum(1 for _, result, _, _ in results if result == "D")
+    goals_for = sum(gf for _, _, gf, _ in results)
+    goals_against = sum(ga for _, _, _, ga in results)
+    return {
+        "played_games": len(results),
+        "won": won,
+        "draw": draw,
+        "lost": len(results) - won - draw,
+        "points": won * 3 + draw,
+        "goals_for": goals_for,
+        "goals_against": goals_against,
+        "goal_difference": goals_for - goals_against,
+    }
+
+
+def _form(results: List[Tuple[int, str, int, int]]) -> List[str]:
+    return [result for _, result, _, _ in results][-FORM_LENGTH:]
+
+
+def _affected_teams(
+    conn: sqlite3.Connection, match_ids: Set[int], skip_leagues: Set[int], new_matches: List[Dict[str, Any]]
+) -> Set[Tuple[int, int, int]]:
+    """(season_id, league_id, team_id) das equipas envolvidas nos jogos indicados, tal como estão
+    guardados e tal como vão ficar depois da ingestão (um jogo corrigido pode mudar de equipa)"""
+    columns = ("season_id", "league_id", "home_team_id", "away_team_id")
+    incoming = {row["match_id"]: row for row in new_matches}
+    matches = []
+    for match_id in match_ids:
+        stored = conn.execute(f"SELECT {', '.join(columns)} FROM matches WHERE match_id = ?", (match_id,)).fetchone()
+        stored = dict(zip(columns, stored)) if stored is not None else {}
+        # Colunas omitidas na ingestão mantêm o valor guardado
+        matches += [stored, {**stored, **incoming.get(match_id, {})}]
+
+    affected: Set[Tuple[int, int, int]] = set()
+    for match in matches:
+        if match.get("league_id") is None or match["league_id"] in skip_leagues:
+            continue
+        for team in ("home_team_id", "away_team_id"):
+            if match.get(team) is not None:
+                affected.add((match.get("season_id"), match["league_id"], match[team]))
+    return affected
+
+
+def _snapshot_results(
+    conn: sqlite3.Connection, affected: Set[Tuple[int, int, int]]
+) -> Dict[Tuple[int, int], List[Tuple[int, str, int, int]]]:
+    """Resultados atuais das equipas afetadas (chave: liga, equipa)"""
+    return {(league_id, team_id): _team_results(conn, team_id, league_id) for _, league_id, team_id in affected}
+
+
+def _update_standings(
+    conn: sqlite3.Connection,
+    affected: Set[Tuple[int, int, int]],
+    before: Dict[Tuple[int, int], List[Tuple[int, str, int, int]]],
+) -> Set[int]:
+    """Aplica às linhas da classificação a diferença entre os resultados antes e depois da ingestão.
+
+    As linhas guardadas podem ter ajustes que não vêm dos resultados (ex: pontos retirados),
+    por isso só a variação é somada; sem alterações nos resultados as linhas ficam iguais.
+    """
+    updated: Set[int] = set()
+    moved: Dict[int, Set[int]] = {}
+    next_id = conn.execute("SELECT COALESCE(MAX(standing_id), 0) + 1 FROM standings").fetchone()[0]
+
+    for season_id, league_id, team_id in affected:
+        old_results = before.get((league_id, team_id), [])
+        new_results = _team_results(conn, team_id, league_id)
+        if new_results == old_results:
+            continue
+        old_values, new_values = _aggregate(old_results), _aggregate(new_results)
+        updated.add(league_id)
+
+        stored = conn.execute(
+            f"SELECT standing_id, form, {', '.join(new_values)} FROM standings WHERE league_id = ? AND team_id = ?",
+            (league_id, team_id),
+        ).fetchone()
+
+        if stored is None:
+            values = {**new_values, "form": json.dumps(_form(new_results))}
+            conn.execute(
+                f"""
+                INSERT INTO standings (standing_id, season_id, league_id, team_id, {', '.join(values)})
+                VALUES (?, ?, ?, ?, {', '.join('?' for _ in values)})
+                """,
+                (next_id, season_id, league_id, team_id, *values.values()),
+            )
+            moved.setdefault(league_id, set()).add(next_id)
+            next_id += 1
+            continue
+
+        standing_id, stored_form = stored[0], stored[1]
+        values = {
+            column: (stored_value or 0) + new_values[column] - old_values[column]
+            for column, stored_value in zip(new_values, stored[2:])
+        }
+
+        # Forma: recalculada se coincidia com os resultados; senão juntam-se só os jogos novos
+        if stored_form is None or json.loads(stored_form) == _form(old_results):
+            form = _form(new_results)
+        else:
+            old_ids = {match_id for match_id, _, _, _ in old_results}
+            added = [result for match_id, result, _, _ in new_results if match_id not in old_ids]
+            form = (json.loads(stored_form) + added)[-FORM_LENGTH:]
+        values["form"] = json.dumps(form)
+
+        conn.execute(
+            f"UPDATE standings SET {', '.join(f'{c} = ?' for c in values)} WHERE standing_id = ?",
+            (*values.values(), standing_id),
+        )
+        if values["points"] != stored[2 + list(new_values).index("points")]:
+            moved.setdefault(league_id, set()).add(standing_id)
+
+    for league_id, standing_ids in moved.items():
+        _rerank(conn, league_id, standing_ids)
+    return updated
+
+
+def _rerank(conn: sqlite3.Connection, league_id: int, moved: Set[int]) -> None:
+    """Reposiciona apenas as equipas cujos pontos mudaram.
+
+    As restantes mantêm a ordem relativa guardada (que pode refletir critérios de desempate
+    como o confronto direto); cada equipa movida entra depois das que têm mais pontos e, em
+    caso de empate, antes da primeira com pior diferença de golos / golos marcados.
+    """
+    rows = conn.execute(
+        """
+        SELECT standing_id, position, points, goal_difference, goals_for
+        FROM standings
+        WHERE league_id = ?
+        ORDER BY position IS NULL, position, standing_id
+        """,
+        (league_id,),
+    ).fetchall()
+
+    def rank_key(row: Tuple[Any, ...]) -> Tuple[int, int, int]:
+        return (row[2] or 0, row[3] or 0, row[4] or 0)
+
+    ranking = [row for row in rows if row[0] not in moved]
+    for row in sorted((row for row in rows if row[0] in moved), key=rank_key, reverse=True):
+        index = next((i for i, other in enumerate(ranking) if rank_key(other) < rank_key(row)), len(ranking))
+        ranking.insert(index, row)
+
+    conn.executemany(
+        "UPDATE standings SET position = ? WHERE standing_id = ?",
+        [(position, row[0]) for position, row in enumerate(ranking, start=1) if row[1] != position],
+    )
+
+
+def ingest(
+    season: Optional[str] = None,
+    matches: Optional[List[Dict[str, Any]]] = None,
+    scores: Optional[List[Dict[str, Any]]] = None,
+    players: Optional[List[Dict[str, Any]]] = None,
+    standings: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """Ingere os registos numa época e publica uma nova versão dos dados"""
+    shard = get_shard(season)
+    data = {"matches": matches, "scores": scores, "players": players, "standings": standings}
+    rows = {table: _validate(table, records) for table, records in data.items() if records}
+
+    conn = sqlite3.connect(shard.path, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Jogos afetados pelos novos jogos e resultados
+            match_ids = _column(rows.get("matches", []), "match_id")
+            match_ids |= _column(rows.get("scores", []), "match_id")
+
+            # Ligas com classificação fornecida explicitamente não são recalculadas
+            provided = _column(rows.get("standings", []), "league_id")
+
+            # Resultados das equipas afetadas antes da ingestão (inclui equipas de jogos corrigidos)
+            affected = _affected_teams(conn, match_ids, provided, rows.get("matches", []))
+            before = _snapshot_results(conn, affected)
+
+            for table, table_rows in rows.items():
+                _upsert(conn, table, table_rows)
+            _update_winners(conn, match_ids)
+
+            leagues = _update_standings(conn, affected, before)
+
+            version = conn.execute("PRAGMA user_version").fetchone()[0] + 1
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+
+    shard.refresh_version()
+    summary = {
+        "season": shard.season,
+        "version": version,
+        "rows": {table: len(table_rows) for table, table_rows in rows.items()},
+        "standings_recomputed": sorted(leagues),
+    }
+    logger.info(f"Ingestão concluída: {summary}")
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Ingerir jogos, resultados, jogadores e classificações (CSV ou JSON)"
+    )
+    parser.add_argument("--season", help="Época de destino (por omissão a mais recente)")
+    for table in TABLES:
+        parser.add_argument(f"--{table}", metavar="FICHEIRO", help=f"Ficheiro com registos de {table}")
+    args = parser.parse_args(argv)
+
+    files = {table: getattr(args, table) for table in TABLES if getattr(args, table)}
+    if not files:
+        parser.error("Indicar pelo menos um ficheiro a ingerir")
+
+    summary = ingest(args.season, **{table: load_records(path) for table, path in files.items()})
+    print(json.dumps(summary, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
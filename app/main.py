@@ -1,21 +1,23 @@
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from fastapi_mcp import FastApiMCP
-from app.routers import leagues, matches, teams
-from app.database import get_db_connection
+from app.routers import leagues, matches, teams, players, admin
+from app.database import get_db_connection, init_shards, list_seasons, default_season, dataset_versions
 from app.config import settings
 from app.logging_config import logger
-import os
+from app.mcp_dispatch import InProcessFastApiMCP, INTERNAL_ERROR_DETAIL
+from app.memory import start_tracemalloc
 import time
 
-# Verificar se a base de dados existe
-if not os.path.exists(settings.DATABASE_PATH):
-    raise FileNotFoundError(f"Base de dados '{settings.DATABASE_PATH}' não encontrada")
+# Ativar tracemalloc o mais cedo possível (se configurado)
+start_tracemalloc()
+
+# Verificar se as bases de dados existem e criar os índices de cada época
+init_shards()
 
 app = FastAPI(
     title="⚽ Football API",
-    description="API para consulta de dados das principais ligas europeias de futebol (2023-2024)",
+    description="API para consulta de dados das principais ligas europeias de futebol (várias épocas)",
     version=settings.API_VERSION,
     docs_url=settings.docs_url,
     redoc_url=settings.redoc_url
@@ -53,17 +55,20 @@ async def global_exception_handler(request: Request, exc: Exception):
     logger.error(f"Erro não tratado: {exc}", exc_info=True)
     return JSONResponse(
         status_code=500,
-        content={"detail": "Erro interno do servidor. Contacte o administrador."}
+        content={"detail": INTERNAL_ERROR_DETAIL}
     )
 
 # Incluir routers
 app.include_router(leagues.router, prefix="/api/v1", tags=["leagues"])
 app.include_router(matches.router, prefix="/api/v1", tags=["matches"])
 app.include_router(teams.router, prefix="/api/v1", tags=["teams"])
+app.include_router(players.router, prefix="/api/v1", tags=["players"])
+if settings.ENABLE_ADMIN:
+    app.include_router(admin.router, prefix="/api/v1", tags=["admin"])
 
 # Endpoint de health check
 @app.get("/api/v1/health", operation_id="health_check")
-async def health_check():
+def health_check():
     """Verificar estado da API e conectividade da base de dados"""
     try:
         conn = get_db_connection()
@@ -76,6 +81,8 @@ async def health_check():
             "status": "healthy",
             "database": "connected",
             "leagues_available": league_count,
+            "seasons": list_seasons(),
+            "dataset_versions": dataset_versions(),
             "timestamp": time.time()
         }
     except Exception as e:
@@ -83,14 +90,17 @@ async def health_check():
         raise HTTPException(status_code=503, detail="Base de dados indisponível")
 
 # Criar e configurar MCP Server
-mcp = FastApiMCP(
+# As tools são executadas chamando diretamente os handlers (sem pedido HTTP interno)
+mcp = InProcessFastApiMCP(
     app,
     name="Football Data MCP",
-    description="MCP server para consulta de dados de futebol das principais ligas europeias (2023-2024). Fornece informações sobre equipas, jogadores, jogos, classificações e estatísticas das 5 principais ligas: Premier League, La Liga, Serie A, Bundesliga e Ligue 1.",
+    description="MCP server para consulta de dados de futebol das principais ligas europeias (várias épocas; usar o parâmetro season, ex: 2023-2024 ou 'all'). Fornece informações sobre equipas, jogadores (pesquisa e estatísticas de plantéis), jogos, classificações e estatísticas das 5 principais ligas: Premier League, La Liga, Serie A, Bundesliga e Ligue 1.",
     # Incluir todas as respostas possíveis nas descrições das tools
     describe_all_responses=True,
     # Incluir schema JSON completo para melhor compreensão dos agentes
-    describe_full_response_schema=True
+    describe_full_response_schema=True,
+    # Endpoints de administração não são expostos aos agentes
+    exclude_tags=["admin"]
 )
 
 # Montar o MCP server na aplicação
@@ -110,7 +120,8 @@ async def root():
         "message": "⚽ Football API - Dados das Principais Ligas Europeias",
         "version": settings.API_VERSION,
         "environment": settings.ENVIRONMENT,
-        "season": "2023-2024",
+        "season": default_season(),
+        "seasons": list_seasons(),
         "leagues": [
             "Premier League (Inglaterra)",
             "La Liga (Espanha)", 
@@ -123,6 +134,7 @@ async def root():
             "leagues": "/api/v1/leagues",
             "teams": "/api/v1/teams",
             "matches": "/api/v1/matches",
+            "players": "/api/v1/players",
             "mcp": "/mcp"
         }
     }
@@ -0,0 +1,111 @@
+import heapq
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.config import settings
+from app.database import get_shard
+from app.memory import ByteLRUCache, MB
+
+# Query usada para construir o índice (uma vez por época e versão dos dados)
+CALENDAR_QUERY = """
+    SELECT
+        m.*,
+        ht.name as home_team_name,
+        at.name as away_team_name,
+        l.name as league_name,
+        s.full_time_home,
+        s.full_time_away
+    FROM matches m
+    LEFT JOIN teams ht ON m.home_team_id = ht.team_id
+    LEFT JOIN teams at ON m.away_team_id = at.team_id
+    LEFT JOIN leagues l ON m.league_id = l.league_id
+    LEFT JOIN scores s ON m.match_id = s.match_id
+    WHERE m.utc_date IS NOT NULL
+    ORDER BY m.utc_date, m.match_id
+"""
+
+
+class MatchCalendar:
+    """Índice de jogos ordenado por data, global e por liga.
+
+    As datas são guardadas como 'YYYY-MM-DD' em listas ordenadas, pelo que uma
+    pesquisa por intervalo custa O(log n + k) com `bisect`.
+    """
+
+    def __init__(self, season: str, version: int, rows: List[Dict[str, Any]]):
+        self.season = season
+        self.version = version
+        self._dates: Dict[Optional[int], List[str]] = {None: []}
+        self._rows: Dict[Optional[int], List[Dict[str, Any]]] = {None: []}
+
+        # As linhas já vêm ordenadas por data, logo cada lista por liga também fica ordenada
+        for row in rows:
+            day = str(row["utc_date"])[:10]
+            for key in (None, row["league_id"]):
+                self._dates.setdefault(key, []).append(day)
+                self._rows.setdefault(key, []).append(row)
+
+    def range(self, start: Optional[date] = None, end: Optional[date] = None,
+              league_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Jogos entre `start` e `end` (inclusive), por ordem cronológica"""
+        dates = self._dates.get(league_id, [])
+        rows = self._rows.get(league_id, [])
+        lo = bisect_left(dates, start.isoformat()) if start else 0
+        hi = bisect_right(dates, end.isoformat()) if end else len(dates)
+        return rows[lo:hi]
+
+    def day(self, day: date, league_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self.range(day, day, league_id)
+
+    def last_match_days(self, count: int, league_id: Optional[int] = None) -> Tuple[Optional[date], Optional[date]]:
+        """Primeiro e último dia dos últimos `count` dias com jogos"""
+        dates = self._dates.get(league_id, [])
+        if not dates:
+            return None, None
+        first = dates[-1]
+        for _ in range(count - 1):
+            i = bisect_left(dates, first)
+            if i == 0:
+                break
+            first = dates[i - 1]
+        return date.fromisoformat(first), date.fromisoformat(dates[-1])
+
+    def bounds(self) -> Tuple[Optional[str], Optional[str]]:
+        """Primeira e última data com jogos"""
+        dates = self._dates[None]
+        return (dates[0], dates[-1]) if dates else (None, None)
+
+
+# Índices por (época, versão dos dados); podem ser descartados sob pressão de memória
+_calendars = ByteLRUCache("match_calendar", int(settings.INDEX_CACHE_MB * MB))
+_lock = threading.Lock()
+
+
+def get_calendar(season: Optional[str] = None) -> MatchCalendar:
+    """Índice da época, reconstruído quando a versão dos dados muda"""
+    shard = get_shard(season)
+    key = (shard.season, shard.version)
+    calendar = _calendars.get(key)
+    if calendar is None:
+        with _lock:
+            calendar = _calendars.get(key)
+            if calendar is None:
+                calendar = MatchCalendar(shard.season, key[1], shard.query(CALENDAR_QUERY, cache=False))
+                _calendars.put(key, calendar)
+    return calendar
+
+
+def calendar_range(seasons: List[str], start: Optional[date] = None, end: Optional[date] = None,
+                   league_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Jogos entre duas datas em várias épocas, juntos por ordem cronológica"""
+    if len(seasons) == 1:
+        return get_calendar(seasons[0]).range(start, end, league_id)
+
+    def tagged(season: str) -> Iterable[Dict[str, Any]]:
+        return ({**row, "season": season} for row in get_calendar(season).range(start, end, league_id))
+
+    return list(heapq.merge(
+        *(tagged(season) for season in seasons),
+        key=lambda m: (str(m["utc_date"])[:10], m["match_id"])
+    ))
@@ -0,0 +1,124 @@
+import asyncio
+import json
+from typing import Any, Dict, List, Optional, Union
+
+import mcp.types as types
+from fastapi import FastAPI, HTTPException
+from fastapi.dependencies.utils import request_params_to_args
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute, run_endpoint_function, serialize_response
+from fastapi_mcp import FastApiMCP
+from fastapi_mcp.types import HTTPRequestInfo
+
+from app.logging_config import logger
+
+# Mensagem devolvida em erros não tratados (igual à do global_exception_handler)
+INTERNAL_ERROR_DETAIL = "Erro interno do servidor. Contacte o administrador."
+
+
+class InProcessFastApiMCP(FastApiMCP):
+    """
+    Servidor MCP que executa as tools chamando diretamente os handlers das rotas.
+
+    O `FastApiMCP` original transforma cada chamada de tool num pedido HTTP interno
+    (routing, middleware, CORS, JSON) e volta a fazer parse da resposta. Aqui os
+    argumentos são validados com os mesmos parâmetros declarados na rota e o
+    resultado é serializado uma única vez para o texto da resposta MCP.
+    Os handlers síncronos (acesso bloqueante ao SQLite) correm no threadpool, como no
+    pedido HTTP, pelo que tools concorrentes não bloqueiam o event loop.
+    Rotas com body ou dependências continuam a usar o caminho HTTP.
+    """
+
+    def setup_server(self) -> None:
+        super().setup_server()
+        self._routes: Dict[str, APIRoute] = self._build_route_map(self.fastapi)
+
+    @staticmethod
+    def _build_route_map(fastapi: FastAPI) -> Dict[str, APIRoute]:
+        """Mapear operation_id -> rota para as rotas que podem ser chamadas diretamente"""
+        routes: Dict[str, APIRoute] = {}
+        for route in fastapi.routes:
+            if not isinstance(route, APIRoute):
+                continue
+            dependant = route.dependant
+            # Apenas rotas que dependem só de parâmetros de path/query
+            if (
+                dependant.dependencies
+                or dependant.body_params
+                or dependant.header_params
+                or dependant.cookie_params
+                or dependant.request_param_name
+                or dependant.http_connection_param_name
+                or dependant.response_param_name
+                or dependant.background_tasks_param_name
+            ):
+                continue
+            operation_id = route.operation_id or route.unique_id
+            routes[operation_id] = route
+        return routes
+
+    async def _execute_api_tool(
+        self,
+        client: Any,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        operation_map: Dict[str, Dict[str, Any]],
+        http_request_info: Optional[HTTPRequestInfo] = None,
+    ) -> List[Union[types.TextContent, types.ImageContent, types.EmbeddedResource]]:
+        route = self._routes.get(tool_name)
+        if route is None or tool_name not in operation_map:
+            return await super()._execute_api_tool(
+                client, tool_name, arguments, operation_map, http_request_info
+            )
+
+        try:
+            result = await self.call_route(route, arguments or {})
+        except HTTPException as e:
+            raise Exception(
+                f"Error calling {tool_name}. Status code: {e.status_code}. "
+                f"Response: {json.dumps({'detail': e.detail}, ensure_ascii=False)}"
+            )
+        except RequestValidationError as e:
+            raise Exception(
+                f"Error calling {tool_name}. Status code: 422. "
+                f"Response: {json.dumps({'detail': e.errors()}, ensure_ascii=False, default=str)}"
+            )
+        except Exception:
+            # Mesma resposta que o global_exception_handler: não expor detalhes internos ao agente
+            logger.exception(f"Erro ao executar a tool MCP {tool_name}")
+            raise Exception(
+                f"Error calling {tool_name}. Status code: 500. "
+                f"Response: {json.dumps({'detail': INTERNAL_ERROR_DETAIL}, ensure_ascii=False)}"
+            ) from None
+
+        result_text = json.dumps(result, indent=2, ensure_ascii=False)
+        return [types.TextContent(type="text", text=result_text)]
+
+    @staticmethod
+    async def call_route(route: APIRoute, arguments: Dict[str, Any]) -> Any:
+        """Validar os argumentos, executar o handler da rota e serializar o resultado"""
+        dependant = route.dependant
+        path_values, path_errors = request_params_to_args(dependant.path_params, arguments)
+        query_values, query_errors = request_params_to_args(dependant.query_params, arguments)
+        errors = path_errors + query_errors
+        if errors:
+            raise RequestValidationError(errors)
+
+        # Handlers `def` são executados no threadpool por run_endpoint_function
+        is_coroutine = asyncio.iscoroutinefunction(dependant.call)
+        raw_response = await run_endpoint_function(
+            dependant=dependant,
+            values={**path_values, **query_values},
+            is_coroutine=is_coroutine,
+        )
+        return await serialize_response(
+            field=route.response_field,
+            response_content=raw_response,
+            include=route.response_model_include,
+            exclude=route.response_model_exclude,
+            by_alias=route.response_model_by_alias,
+            exclude_unset=route.response_model_exclude_unset,
+            exclude_defaults=route.response_model_exclude_defaults,
+            exclude_none=route.response_model_exclude_none,
+            is_coroutine=is_coroutine,
+        )
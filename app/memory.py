@@ -0,0 +1,193 @@
+import os
+import resource
+import sys
+import threading
+import tracemalloc
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+from app.config import settings
+
+MB = 1024 * 1024
+
+
+def estimate_size(obj: Any) -> int:
+    """Estimativa (em bytes) da memória ocupada por um objeto e pelos objetos que contém"""
+    seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif hasattr(current, "__dict__"):
+            stack.append(vars(current))
+    return size
+
+
+class ByteLRUCache:
+    """Cache LRU limitada pelo tamanho estimado das entradas (em bytes) e pelo orçamento global"""
+
+    def __init__(self, name: str, max_bytes: int):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        budget.register(self)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with budget.lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, size: Optional[int] = None) -> None:
+        size = estimate_size(value) if size is None else size
+        # Entradas maiores que o limite da cache (ou do orçamento) não são guardadas
+        if size > self.max_bytes or size > budget.max_bytes:
+            return
+        with budget.lock:
+            self._remove(key)
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                self.evict_oldest()
+            budget.enforce()
+
+    def evict_oldest(self) -> None:
+        key = next(iter(self._entries))
+        self._remove(key)
+        self.evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry[1]
+
+    def clear(self) -> None:
+        with budget.lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class MemoryBudget:
+    """Orçamento de memória partilhado por todas as caches (MEMORY_BUDGET_MB)"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.lock = threading.RLock()
+        self._caches: List[ByteLRUCache] = []
+
+    def register(self, cache: ByteLRUCache) -> None:
+        with self.lock:
+            self._caches.append(cache)
+
+    def unregister(self, cache: ByteLRUCache) -> None:
+        with self.lock:
+            if cache in self._caches:
+                self._caches.remove(cache)
+
+    @property
+    def used_bytes(self) -> int:
+        return sum(cache.current_bytes for cache in self._caches)
+
+    def enforce(self) -> None:
+        """Sob pressão, descarta as entradas mais antigas da cache que ocupa mais memória"""
+        with self.lock:
+            while self.used_bytes > self.max_bytes:
+                largest = max(self._caches, key=lambda cache: cache.current_bytes)
+                largest.evict_oldest()
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "budget_bytes": self.max_bytes,
+                "used_bytes": self.used_bytes,
+                "caches": sorted(
+                    (cache.stats() for cache in self._caches),
+                    key=lambda stats: stats["bytes"],
+                    reverse=True
+                ),
+            }
+
+
+budget = MemoryBudget(int(settings.MEMORY_BUDGET_MB * MB))
+
+
+def process_memory() -> Dict[str, Optional[int]]:
+    """RSS atual e máximo do processo e limite de memória do container (cgroup), em bytes"""
+    rss = None
+    try:
+        with open("/proc/self/statm") as f:
+            rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        pass
+
+    # ru_maxrss é em KB no Linux e em bytes no macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_rss = peak if sys.platform == "darwin" else peak * 1024
+
+    limit = None
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        try:
+            with open(path) as f:
+                value = f.read().strip()
+            # "max" (cgroup v2) ou um valor enorme (cgroup v1) significam sem limite
+            limit = int(value) if value.isdigit() and int(value) < 2 ** 60 else None
+            break
+        except OSError:
+            continue
+
+    return {"rss_bytes": rss, "peak_rss_bytes": peak_rss, "container_limit_bytes": limit}
+
+
+def start_tracemalloc() -> None:
+    """Ativa o tracemalloc se TRACEMALLOC_FRAMES > 0 (tem custo em CPU e memória)"""
+    if settings.TRACEMALLOC_FRAMES > 0 and not tracemalloc.is_tracing():
+        tracemalloc.start(settings.TRACEMALLOC_FRAMES)
+
+
+def top_allocations(limit: int = 10) -> List[Dict[str, Any]]:
+    """Locais do código com mais memória alocada (requer tracemalloc ativo)"""
+    if not tracemalloc.is_tracing():
+        return []
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ))
+    return [
+        {
+            "location": str(stat.traceback[0]),
+            "traceback": stat.traceback.format(),
+            "size_bytes": stat.size,
+            "count": stat.count,
+        }
+        for stat in snapshot.statistics("traceback")[:limit]
+    ]
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Query
+from app.memory import budget, process_memory, top_allocations
+import tracemalloc
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+@router.get("/memory")
+def get_memory_usage(
+    top: int = Query(10, ge=1, le=100, description="Número de locais de alocação a mostrar")
+):
+    """Obter RSS do processo, memória usada por cada cache e principais alocações (tracemalloc)"""
+    return {
+        "process": process_memory(),
+        "caches": budget.stats(),
+        "tracemalloc": {
+            "enabled": tracemalloc.is_tracing(),
+            "traced_bytes": tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None,
+            "top_allocations": top_allocations(top)
+        }
+    }
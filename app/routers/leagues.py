@@ -2,22 +2,27 @@ from fastapi import APIRouter, HTTPException, Query
 from typing import List, Optional
 from app.models import League, PaginatedResponse
 from app.database import execute_query, execute_single_query
-from app.utils import paginate_query
+from app.utils import paginate_query, resolve_season
 
 router = APIRouter(prefix="/leagues", tags=["Leagues"])
 
 @router.get("/", response_model=List[League])
-async def get_leagues():
+def get_leagues(
+    season: Optional[str] = Query(None, description="Época (ex: 2023-2024); por omissão a mais recente")
+):
     """Obter todas as ligas"""
     query = "SELECT * FROM leagues ORDER BY name"
-    leagues = execute_query(query)
+    leagues = execute_query(query, season=resolve_season(season))
     return leagues
 
 @router.get("/{league_id}", response_model=League)
-async def get_league(league_id: int):
+def get_league(
+    league_id: int,
+    season: Optional[str] = Query(None, description="Época (ex: 2023-2024); por omissão a mais recente")
+):
     """Obter uma liga específica pelo ID"""
     query = "SELECT * FROM leagues WHERE league_id = ?"
-    league = execute_single_query(query, (league_id,))
+    league = execute_single_query(query, (league_id,), resolve_season(season))
     
     if not league:
         raise HTTPException(status_code=404, detail="Liga não encontrada")
@@ -25,10 +30,15 @@ async def get_league(league_id: int):
     return league
 
 @router.get("/{league_id}/teams")
-async def get_league_teams(league_id: int):
+def get_league_teams(
+    league_id: int,
+    season: Optional[str] = Query(None, description="Época (ex: 2023-2024); por omissão a mais recente")
+):
     """Obter todas as equipas de uma liga"""
+    season = resolve_season(season)
+    
     # Verificar se a liga existe
-    league = execute_single_query("SELECT * FROM leagues WHERE league_id = ?", (league_id,))
+    league = execute_single_query("SELECT * FROM leagues WHERE league_id = ?", (league_id,), season)
     if not league:
         raise HTTPException(status_code=404, detail="Liga não encontrada")
     
@@ -40,14 +50,19 @@ async def get_league_teams(league_id: int):
         WHERE t.league_id = ?
         ORDER BY t.name
     """
-    teams = execute_query(query, (league_id,))
+    teams = execute_query(query, (league_id,), season)
     return teams
 
 @router.get("/{league_id}/standings")
-async def get_league_standings(league_id: int):
+def get_league_standings(
+    league_id: int,
+    season: Optional[str] = Query(None, description="Época (ex: 2023-2024); por omissão a mais recente")
+):
     """Obter a classificação de uma liga"""
+    season = resolve_season(season)
+    
     # Verificar se a liga existe
-    league = execute_single_query("SELECT * FROM leagues WHERE league_id = ?", (league_id,))
+    league = execute_single_query("SELECT * FROM leagues WHERE league_id = ?", (league_id,), season)
     if not league:
         raise HTTPException(status_code=404, detail="Liga não encontrada")
     
@@ -61,8 +76,9 @@ async def get_league_standings(league_id: int):
         WHERE s.league_id = ?
         ORDER BY s.position
     """
-    standings = execute_query(query, (league_id,))
+    standings = execute_query(query, (league_id,), season)
     return {
         "league": league,
+        "season": season,
         "standings": standings
     } 
\ No newline at end of file
@@ -1,22 +1,35 @@
 from fastapi import APIRouter, HTTPException, Query
 from typing import List, Optional
-from datetime import date
+from datetime import date, timedelta
 from app.models import Match, PaginatedResponse
-from app.database import execute_query, execute_single_query
-from app.utils import paginate_query, build_where_clause
+from app.database import execute_single_query
+from app.match_calendar import get_calendar, calendar_range
+from app.utils import paginate_query_seasons, build_where_clause, resolve_season, resolve_seasons
 
 router = APIRouter(prefix="/matches", tags=["Matches"])
 
+# Máximo de dias devolvidos por /matches/upcoming (a resposta não é paginada)
+MAX_UPCOMING_DAYS = 30
+
 @router.get("/")
-async def get_matches(
+def get_matches(
     page: int = Query(1, ge=1, description="Número da página"),
     size: int = Query(20, ge=1, le=100, description="Itens por página"),
     league_id: Optional[int] = Query(None, description="Filtrar por liga"),
     team_id: Optional[int] = Query(None, description="Filtrar por equipa"),
     matchday: Optional[int] = Query(None, description="Filtrar por jornada"),
-    winner: Optional[str] = Query(None, description="Filtrar por vencedor (HOME_TEAM, AWAY_TEAM, DRAW)")
+    winner: Optional[str] = Query(None, description="Filtrar por vencedor (HOME_TEAM, AWAY_TEAM, DRAW)"),
+    date_from: Optional[date] = Query(None, alias="from", description="Jogos a partir desta data (YYYY-MM-DD)"),
+    date_to: Optional[date] = Query(None, alias="to", description="Jogos até esta data, inclusive (YYYY-MM-DD)"),
+    as_of: Optional[date] = Query(None, description="Apenas jogos realizados até esta data (YYYY-MM-DD)"),
+    season: Optional[str] = Query(None, description="Época (ex: 2023-2024), lista separada por vírgulas ou 'all'; por omissão a mais recente")
 ):
     """Obter jogos com filtros e paginação"""
+    seasons = resolve_seasons(season)
+    # O fim do intervalo é o mais restritivo entre 'to' e 'as_of'
+    end_param = "as_of" if as_of and (date_to is None or as_of < date_to) else "to"
+    date_to = as_of if end_param == "as_of" else date_to
+    _check_date_range(date_from, date_to, end_param=end_param)
     
     # Construir filtros
     filters = {}
@@ -53,15 +66,30 @@ async def get_matches(
         where_clause += "(m.home_team_id = ? OR m.away_team_id = ?)"
         params = params + (team_id, team_id)
     
+    # Intervalo de datas (usa o índice sobre utc_date; o fim é exclusivo para aceitar datas com hora)
+    if date_from:
+        where_clause += (" AND " if where_clause else "") + "m.utc_date >= ?"
+        params = params + (date_from.isoformat(),)
+    if date_to:
+        where_clause += (" AND " if where_clause else "") + "m.utc_date < ?"
+        params = params + ((date_to + timedelta(days=1)).isoformat(),)
+    
     if where_clause:
         base_query += f" WHERE {where_clause}"
     
     base_query += " ORDER BY m.utc_date DESC, m.match_id"
     
-    return paginate_query(base_query, params, page, size)
+    return paginate_query_seasons(
+        base_query, params, page, size, seasons,
+        sort_key=lambda m: (m["utc_date"] or "", -m["match_id"]),
+        reverse=True
+    )
 
 @router.get("/{match_id}")
-async def get_match(match_id: int):
+def get_match(
+    match_id: int,
+    season: Optional[str] = Query(None, description="Época (ex: 2023-2024); por omissão a mais recente")
+):
     """Obter detalhes de um jogo específico"""
     query = """
         SELECT 
@@ -84,7 +112,7 @@ async def get_match(match_id: int):
         WHERE m.match_id = ?
     """
     
-    match = execute_single_query(query, (match_id,))
+    match = execute_single_query(query, (match_id,), resolve_season(season))
     
     if not match:
         raise HTTPException(status_code=404, detail="Jogo não encontrado")
@@ -92,36 +120,71 @@ async def get_match(match_id: int):
     return match
 
 @router.get("/upcoming/")
-async def get_upcoming_matches(
-    days: int = Query(7, ge=1, le=30, description="Próximos X dias"),
-    league_id: Optional[int] = Query(None, description="Filtrar por liga")
+def get_upcoming_matches(
+    days: int = Query(7, ge=1, le=MAX_UPCOMING_DAYS, description="Próximos X dias"),
+    league_id: Optional[int] = Query(None, description="Filtrar por liga"),
+    as_of: Optional[date] = Query(None, description="Data de referência (YYYY-MM-DD); por omissão hoje"),
+    date_from: Optional[date] = Query(None, alias="from", description="Início do intervalo (substitui as_of)"),
+    date_to: Optional[date] = Query(None, alias="to", description=f"Fim do intervalo, inclusive (substitui days; máximo {MAX_UPCOMING_DAYS} dias)"),
+    season: Optional[str] = Query(None, description="Época (ex: 2023-2024), lista separada por vírgulas ou 'all'; por omissão a mais recente")
 ):
-    """Obter próximos jogos (simulação - todos os jogos são de 2023-2024)"""
+    """Obter os jogos dos próximos dias a partir de uma data, por ordem cronológica"""
+    seasons = resolve_seasons(season)
     
-    # Como todos os dados são históricos, vamos retornar os últimos jogos
-    # ordenados por data como se fossem próximos
-    base_query = """
-        SELECT 
-            m.*,
-            ht.name as home_team_name,
-            at.name as away_team_name,
-            l.name as league_name
-        FROM matches m
-        LEFT JOIN teams ht ON m.home_team_id = ht.team_id
-        LEFT JOIN teams at ON m.away_team_id = at.team_id
-        LEFT JOIN leagues l ON m.league_id = l.league_id
-    """
-    
-    filters = {}
-    if league_id:
-        filters["m.league_id"] = league_id
+    start, end = date_from or as_of, date_to
+    if start is None and end:
+        # Só o fim do intervalo: os `days` dias que terminam em 'to'
+        start = end - timedelta(days=days - 1)
+    elif start is None:
+        start = date.today()
+        # Épocas históricas (sem jogos depois de hoje): simular com os últimos `days` dias com jogos
+        calendar = max((get_calendar(s) for s in seasons), key=lambda c: c.bounds()[1] or "")
+        first_day, last_day = calendar.last_match_days(days, league_id)
+        if last_day and last_day < start:
+            start, end = first_day, last_day
+    end = end or start + timedelta(days=days - 1)
+    _check_date_range(
+        start, end,
+        start_param="from" if date_from else "as_of",
+        max_days=MAX_UPCOMING_DAYS if date_to else None
+    )
     
-    where_clause, params = build_where_clause(filters)
-    if where_clause:
-        base_query += f" WHERE {where_clause}"
+    return calendar_range(seasons, start, end, league_id)
+
+@router.get("/fixtures/{day}")
+def get_fixtures(
+    day: date,
+    league_id: Optional[int] = Query(None, description="Filtrar por liga"),
+    season: Optional[str] = Query(None, description="Época (ex: 2023-2024), lista separada por vírgulas ou 'all'; por omissão a mais recente")
+):
+    """Obter todos os jogos de um dia (YYYY-MM-DD), agrupados por liga"""
+    matches = calendar_range(resolve_seasons(season), day, day, league_id)
     
-    base_query += " ORDER BY m.utc_date DESC LIMIT ?"
-    params = params + (days * 3,)  # Multiplicar por 3 para ter mais jogos
+    leagues = {}
+    for match in matches:
+        league = leagues.setdefault(match["league_id"], {
+            "league_id": match["league_id"],
+            "league_name": match["league_name"],
+            "matches": []
+        })
+        league["matches"].append(match)
     
-    matches = execute_query(base_query, params)
-    return matches 
\ No newline at end of file
+    return {
+        "date": day,
+        "total_matches": len(matches),
+        "leagues": list(leagues.values())
+    }
+
+def _check_date_range(start: Optional[date], end: Optional[date], start_param: str = "from", end_param: str = "to",
+                      max_days: Optional[int] = None):
+    """Validar que o início do intervalo não é posterior ao fim e, se indicado, a sua duração máxima"""
+    if start and end and start > end:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Intervalo de datas inválido: '{start_param}' posterior a '{end_param}'"
+        )
+    if max_days and start and end and (end - start).days + 1 > max_days:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Intervalo de datas demasiado longo entre '{start_param}' e '{end_param}': máximo {max_days} dias"
+        )
@@ -0,0 +1,161 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+from datetime import date
+from app.database import execute_single_query
+from app.squad_stats import age_on, age_reference_date, get_squad_stats
+from app.utils import paginate_query_seasons, resolve_season, resolve_seasons
+
+router = APIRouter(prefix="/players", tags=["Players"])
+
+def _years_before(reference: date, years: int) -> date:
+    """Data `years` anos antes da referência (29/02 passa a 28/02)"""
+    try:
+        return reference.replace(year=reference.year - years)
+    except ValueError:
+        return reference.replace(year=reference.year - years, day=28)
+
+@router.get("/")
+def get_players(
+    page: int = Query(1, ge=1, description="Número da página"),
+    size: int = Query(20, ge=1, le=100, description="Itens por página"),
+    nationality: Optional[str] = Query(None, description="Filtrar por nacionalidade (ex: Portugal)"),
+    position: Optional[str] = Query(None, description="Filtrar por posição (Goalkeeper, Defence, Midfield, Offence)"),
+    min_age: Optional[int] = Query(None, ge=0, description="Idade mínima (no último dia com jogos da época)"),
+    max_age: Optional[int] = Query(None, ge=0, description="Idade máxima (no último dia com jogos da época)"),
+    league_id: Optional[int] = Query(None, description="Filtrar por liga"),
+    team_id: Optional[int] = Query(None, description="Filtrar por equipa"),
+    search: Optional[str] = Query(None, description="Pesquisar por nome do jogador"),
+    season: Optional[str] = Query(None, description="Época (ex: 2023-2024), lista separada por vírgulas ou 'all'; por omissão a mais recente")
+):
+    """Pesquisar jogadores com filtros e paginação"""
+    if min_age is not None and max_age is not None and min_age > max_age:
+        raise HTTPException(status_code=400, detail="Intervalo de idades inválido: 'min_age' superior a 'max_age'")
+
+    seasons = resolve_seasons(season)
+    # Idades calculadas na data de referência de cada época (não na data atual)
+    references = {s: age_reference_date(s) for s in seasons}
+    
+    base_query = """
+        SELECT
+            p.*,
+            t.name as team_name,
+            t.league_id,
+            l.name as league_name
+        FROM players p
+        LEFT JOIN teams t ON p.team_id = t.team_id
+        LEFT JOIN leagues l ON t.league_id = l.league_id
+    """
+    
+    conditions = []
+    params = []
+    
+    if nationality:
+        conditions.append("p.nationality = ?")
+        params.append(nationality)
+    if position:
+        conditions.append("p.position = ?")
+        params.append(position)
+    if team_id:
+        conditions.append("p.team_id = ?")
+        params.append(team_id)
+    if league_id:
+        conditions.append("t.league_id = ?")
+        params.append(league_id)
+    if search:
+        conditions.append("p.name LIKE ?")
+        params.append(f"%{search}%")
+    
+    # Filtros de idade convertidos em limites da data de nascimento (usa o índice), por época
+    age_params = {s: [] for s in seasons}
+    if min_age is not None:
+        conditions.append("p.date_of_birth <= ?")
+        for s, reference in references.items():
+            age_params[s].append(_years_before(reference, min_age).isoformat())
+    if max_age is not None:
+        conditions.append("p.date_of_birth > ?")
+        for s, reference in references.items():
+            age_params[s].append(_years_before(reference, max_age + 1).isoformat())
+    
+    if conditions:
+        base_query += " WHERE " + " AND ".join(conditions)
+    
+    base_query += " ORDER BY p.name, p.player_id"
+    
+    result = paginate_query_seasons(
+        base_query, {s: tuple(params + age_params[s]) for s in seasons}, page, size, seasons,
+        sort_key=lambda p: (p["name"] or "", p["player_id"])
+    )
+    result["data"] = [
+        {**p, "age": age_on(p["date_of_birth"], references[p.get("season", seasons[0])])}
+        for p in result["data"]
+    ]
+    return result
+
+@router.get("/{player_id}")
+def get_player(
+    player_id: int,
+    season: Optional[str] = Query(None, description="Época (ex: 2023-2024); por omissão a mais recente")
+):
+    """Obter detalhes de um jogador específico"""
+    query = """
+        SELECT
+            p.*,
+            t.name as team_name,
+            t.cresturl as team_crest,
+            t.league_id,
+            l.name as league_name
+        FROM players p
+        LEFT JOIN teams t ON p.team_id = t.team_id
+        LEFT JOIN leagues l ON t.league_id = l.league_id
+        WHERE p.player_id = ?
+    """
+    
+    season = resolve_season(season)
+    player = execute_single_query(query, (player_id,), season)
+    
+    if not player:
+        raise HTTPException(status_code=404, detail="Jogador não encontrado")
+    
+    reference = age_reference_date(season)
+    return {**player, "age": age_on(player["date_of_birth"], reference), "age_reference_date": reference}
+
+@router.get("/analytics/teams/{team_id}")
+def get_team_squad_analytics(
+    team_id: int,
+    season: Optional[str] = Query(None, description="Época (ex: 2023-2024); por omissão a mais recente")
+):
+    """Obter agregados do plantel de uma equipa (idade média, nacionalidades, posições)"""
+    stats = get_squad_stats(resolve_season(season))
+    team = stats.teams.get(team_id)
+    
+    if not team:
+        raise HTTPException(status_code=404, detail="Equipa não encontrada ou sem jogadores")
+    
+    return {
+        "season": stats.season,
+        "age_reference_date": stats.reference,
+        **team
+    }
+
+@router.get("/analytics/leagues/{league_id}")
+def get_league_squad_analytics(
+    league_id: int,
+    season: Optional[str] = Query(None, description="Época (ex: 2023-2024); por omissão a mais recente")
+):
+    """Obter agregados dos plantéis de uma liga, no total e por equipa"""
+    stats = get_squad_stats(resolve_season(season))
+    league = stats.leagues.get(league_id)
+    
+    if not league:
+        raise HTTPException(status_code=404, detail="Liga não encontrada ou sem jogadores")
+    
+    teams = sorted(
+        (team for team in stats.teams.values() if team["league_id"] == league_id),
+        key=lambda team: team["team_name"] or ""
+    )
+    return {
+        "season": stats.season,
+        "age_reference_date": stats.reference,
+        **league,
+        "teams": teams
+    }
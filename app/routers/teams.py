@@ -1,19 +1,21 @@
 from fastapi import APIRouter, HTTPException, Query
 from typing import List, Optional
 from app.models import Team, PaginatedResponse
-from app.database import execute_query, execute_single_query
-from app.utils import paginate_query, build_where_clause
+from app.database import execute_query, execute_single_query, execute_query_seasons
+from app.utils import paginate_query_seasons, build_where_clause, resolve_season, resolve_seasons
 
 router = APIRouter(prefix="/teams", tags=["Teams"])
 
 @router.get("/")
-async def get_teams(
+def get_teams(
     page: int = Query(1, ge=1, description="Número da página"),
     size: int = Query(20, ge=1, le=100, description="Itens por página"),
     league_id: Optional[int] = Query(None, description="Filtrar por liga"),
-    search: Optional[str] = Query(None, description="Pesquisar por nome da equipa")
+    search: Optional[str] = Query(None, description="Pesquisar por nome da equipa"),
+    season: Optional[str] = Query(None, description="Época (ex: 2023-2024), lista separada por vírgulas ou 'all'; por omissão a mais recente")
 ):
     """Obter equipas com filtros, pesquisa e paginação"""
+    seasons = resolve_seasons(season)
     
     base_query = """
         SELECT 
@@ -48,10 +50,16 @@ async def get_teams(
     
     base_query += " ORDER BY t.name"
     
-    return paginate_query(base_query, tuple(params), page, size)
+    return paginate_query_seasons(
+        base_query, tuple(params), page, size, seasons,
+        sort_key=lambda t: t["name"] or ""
+    )
 
 @router.get("/{team_id}")
-async def get_team(team_id: int):
+def get_team(
+    team_id: int,
+    season: Optional[str] = Query(None, description="Época (ex: 2023-2024); por omissão a mais recente")
+):
     """Obter detalhes de uma equipa específica"""
     query = """
         SELECT 
@@ -70,7 +78,7 @@ async def get_team(team_id: int):
         WHERE t.team_id = ?
     """
     
-    team = execute_single_query(query, (team_id,))
+    team = execute_single_query(query, (team_id,), resolve_season(season))
     
     if not team:
         raise HTTPException(status_code=404, detail="Equipa não encontrada")
@@ -78,14 +86,16 @@ async def get_team(team_id: int):
     return team
 
 @router.get("/{team_id}/players")
-async def get_team_players(
+def get_team_players(
     team_id: int,
-    position: Optional[str] = Query(None, description="Filtrar por posição")
+    position: Optional[str] = Query(None, description="Filtrar por posição"),
+    season: Optional[str] = Query(None, description="Época (ex: 2023-2024); por omissão a mais recente")
 ):
     """Obter jogadores de uma equipa"""
+    season = resolve_season(season)
     
     # Verificar se a equipa existe
-    team = execute_single_query("SELECT * FROM teams WHERE team_id = ?", (team_id,))
+    team = execute_single_query("SELECT * FROM teams WHERE team_id = ?", (team_id,), season)
     if not team:
         raise HTTPException(status_code=404, detail="Equipa não encontrada")
     
@@ -98,7 +108,7 @@ async def get_team_players(
     
     query += " ORDER BY name"
     
-    players = execute_query(query, tuple(params))
+    players = execute_query(query, tuple(params), season)
     return {
         "team": team,
         "players": players,
@@ -106,17 +116,22 @@ async def get_team_players(
     }
 
 @router.get("/{team_id}/matches")
-async def get_team_matches(
+def get_team_matches(
     team_id: int,
     page: int = Query(1, ge=1, description="Número da página"),
     size: int = Query(20, ge=1, le=100, description="Itens por página"),
     home_only: Optional[bool] = Query(None, description="Apenas jogos em casa"),
-    away_only: Optional[bool] = Query(None, description="Apenas jogos fora")
+    away_only: Optional[bool] = Query(None, description="Apenas jogos fora"),
+    season: Optional[str] = Query(None, description="Época (ex: 2023-2024), lista separada por vírgulas ou 'all'; por omissão a mais recente")
 ):
     """Obter jogos de uma equipa"""
+    seasons = resolve_seasons(season)
     
-    # Verificar se a equipa existe
-    team = execute_single_query("SELECT * FROM teams WHERE team_id = ?", (team_id,))
+    # Verificar se a equipa existe (em pelo menos uma das épocas)
+    if len(seasons) == 1:
+        team = execute_single_query("SELECT * FROM teams WHERE team_id = ?", (team_id,), seasons[0])
+    else:
+        team = execute_query_seasons("SELECT * FROM teams WHERE team_id = ?", (team_id,), seasons)
     if not team:
         raise HTTPException(status_code=404, detail="Equipa não encontrada")
     
@@ -148,14 +163,22 @@ async def get_team_matches(
     
     base_query += " ORDER BY m.utc_date DESC"
     
-    return paginate_query(base_query, params, page, size)
+    return paginate_query_seasons(
+        base_query, params, page, size, seasons,
+        sort_key=lambda m: m["utc_date"] or "",
+        reverse=True
+    )
 
 @router.get("/{team_id}/statistics")
-async def get_team_statistics(team_id: int):
+def get_team_statistics(
+    team_id: int,
+    season: Optional[str] = Query(None, description="Época (ex: 2023-2024); por omissão a mais recente")
+):
     """Obter estatísticas de uma equipa"""
+    season = resolve_season(season)
     
     # Verificar se a equipa existe
-    team = execute_single_query("SELECT * FROM teams WHERE team_id = ?", (team_id,))
+    team = execute_single_query("SELECT * FROM teams WHERE team_id = ?", (team_id,), season)
     if not team:
         raise HTTPException(status_code=404, detail="Equipa não encontrada")
     
@@ -174,7 +197,7 @@ async def get_team_statistics(team_id: int):
         WHERE home_team_id = ? OR away_team_id = ?
     """
     
-    stats = execute_single_query(stats_query, (team_id, team_id, team_id, team_id, team_id, team_id))
+    stats = execute_single_query(stats_query, (team_id, team_id, team_id, team_id, team_id, team_id), season)
     
     # Estatísticas de golos
     goals_query = """
@@ -186,7 +209,7 @@ async def get_team_statistics(team_id: int):
         WHERE m.home_team_id = ? OR m.away_team_id = ?
     """
     
-    goals = execute_single_query(goals_query, (team_id, team_id, team_id, team_id))
+    goals = execute_single_query(goals_query, (team_id, team_id, team_id, team_id), season)
     
     # Posição na tabela
     position_query = """
@@ -195,10 +218,11 @@ async def get_team_statistics(team_id: int):
         WHERE team_id = ?
     """
     
-    position = execute_single_query(position_query, (team_id,))
+    position = execute_single_query(position_query, (team_id,), season)
     
     return {
         "team": team,
+        "season": season,
         "statistics": {
             **stats,
             **goals,
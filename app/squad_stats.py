@@ -0,0 +1,98 @@
+import threading
+from collections import Counter
+from datetime import date
+from typing import Any, Dict, List, Optional
+from app.config import settings
+from app.database import get_shard
+from app.match_calendar import get_calendar
+from app.memory import ByteLRUCache, MB
+
+# Query usada para construir os agregados (uma vez por época e versão dos dados)
+SQUAD_QUERY = """
+    SELECT
+        p.team_id,
+        p.position,
+        p.nationality,
+        p.date_of_birth,
+        t.name as team_name,
+        t.league_id
+    FROM players p
+    JOIN teams t ON p.team_id = t.team_id
+"""
+
+
+def age_on(date_of_birth: Optional[str], reference: date) -> Optional[int]:
+    """Idade numa data de referência (None se a data de nascimento for desconhecida)"""
+    if not date_of_birth:
+        return None
+    born = date.fromisoformat(str(date_of_birth)[:10])
+    return reference.year - born.year - ((reference.month, reference.day) < (born.month, born.day))
+
+
+def age_reference_date(season: Optional[str] = None) -> date:
+    """Data em que as idades de uma época são calculadas: o último dia com jogos (hoje se não houver jogos)"""
+    last_day = get_calendar(season).bounds()[1]
+    return date.fromisoformat(last_day) if last_day else date.today()
+
+
+def _summarize(players: List[Dict[str, Any]], reference: date) -> Dict[str, Any]:
+    ages = [age for age in (age_on(p["date_of_birth"], reference) for p in players) if age is not None]
+    return {
+        "total_players": len(players),
+        "average_age": round(sum(ages) / len(ages), 2) if ages else None,
+        "nationalities": dict(Counter(p["nationality"] for p in players if p["nationality"]).most_common()),
+        "positions": dict(Counter(p["position"] for p in players if p["position"]).most_common()),
+    }
+
+
+class SquadStats:
+    """Agregados dos plantéis (idade média, nacionalidades, posições) por equipa e por liga"""
+
+    def __init__(self, season: str, version: int, reference: date, rows: List[Dict[str, Any]]):
+        self.season = season
+        self.version = version
+        self.reference = reference
+
+        by_team: Dict[int, List[Dict[str, Any]]] = {}
+        by_league: Dict[int, List[Dict[str, Any]]] = {}
+        for row in rows:
+            by_team.setdefault(row["team_id"], []).append(row)
+            by_league.setdefault(row["league_id"], []).append(row)
+
+        self.teams: Dict[int, Dict[str, Any]] = {
+            team_id: {
+                "team_id": team_id,
+                "team_name": players[0]["team_name"],
+                "league_id": players[0]["league_id"],
+                **_summarize(players, reference),
+            }
+            for team_id, players in by_team.items()
+        }
+        self.leagues: Dict[int, Dict[str, Any]] = {
+            league_id: {
+                "league_id": league_id,
+                "total_teams": len({p["team_id"] for p in players}),
+                **_summarize(players, reference),
+            }
+            for league_id, players in by_league.items()
+        }
+
+
+# Agregados por (época, versão dos dados); podem ser descartados sob pressão de memória
+_stats = ByteLRUCache("squad_stats", int(settings.INDEX_CACHE_MB * MB))
+_lock = threading.Lock()
+
+
+def get_squad_stats(season: Optional[str] = None) -> SquadStats:
+    """Agregados da época (idades na data de referência da época), reconstruídos quando a versão dos dados muda"""
+    shard = get_shard(season)
+    key = (shard.season, shard.version)
+    stats = _stats.get(key)
+    if stats is None:
+        with _lock:
+            stats = _stats.get(key)
+            if stats is None:
+                reference = age_reference_date(shard.season)
+                stats = SquadStats(shard.season, key[1], reference, shard.query(SQUAD_QUERY, cache=False))
+                _stats.put(key, stats)
+    return stats
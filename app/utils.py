@@ -1,8 +1,36 @@
 import math
-from typing import Dict, List, Any
-from app.database import execute_query
+from typing import Callable, Dict, List, Any, Optional, Union
+from fastapi import HTTPException
+from app.database import execute_query, execute_query_seasons, list_seasons, default_season
 
-def paginate_query(base_query: str, params: tuple = (), page: int = 1, size: int = 20) -> Dict[str, Any]:
+# Valor do parâmetro `season` que seleciona todas as épocas
+ALL_SEASONS = "all"
+
+def resolve_seasons(season: Optional[str]) -> List[str]:
+    """Converte o parâmetro `season` ('2023-2024', '2022-2023,2023-2024' ou 'all') em épocas"""
+    available = list_seasons()
+    if not season:
+        return [default_season()]
+    if season == ALL_SEASONS:
+        return available
+    
+    # Épocas repetidas seriam consultadas (e devolvidas) duas vezes
+    seasons = list(dict.fromkeys(s.strip() for s in season.split(",") if s.strip()))
+    if not seasons:
+        raise HTTPException(status_code=400, detail="Parâmetro 'season' sem épocas")
+    for s in seasons:
+        if s not in available:
+            raise HTTPException(status_code=404, detail=f"Época não encontrada: {s}")
+    return seasons
+
+def resolve_season(season: Optional[str]) -> str:
+    """Como `resolve_seasons`, para endpoints que aceitam apenas uma época"""
+    seasons = resolve_seasons(season)
+    if len(seasons) != 1:
+        raise HTTPException(status_code=400, detail="Este endpoint aceita apenas uma época")
+    return seasons[0]
+
+def paginate_query(base_query: str, params: tuple = (), page: int = 1, size: int = 20, season: Optional[str] = None) -> Dict[str, Any]:
     """Aplica paginação a uma query"""
     # Limitar o tamanho da página
     size = min(size, 100)  # Máximo 100 items por página
@@ -10,12 +38,12 @@ def paginate_query(base_query: str, params: tuple = (), page: int = 1, size: int
     
     # Query para contar total de registos
     count_query = f"SELECT COUNT(*) as total FROM ({base_query})"
-    total_result = execute_query(count_query, params)
+    total_result = execute_query(count_query, params, season)
     total = total_result[0]['total'] if total_result else 0
     
     # Query com paginação
     paginated_query = f"{base_query} LIMIT {size} OFFSET {offset}"
-    data = execute_query(paginated_query, params)
+    data = execute_query(paginated_query, params, season)
     
     return {
         "data": data,
@@ -25,6 +53,42 @@ def paginate_query(base_query: str, params: tuple = (), page: int = 1, size: int
         "total_pages": math.ceil(total / size) if total > 0 else 0
     }
 
+def paginate_query_seasons(
+    base_query: str,
+    params: Union[tuple, Dict[str, tuple]],
+    page: int,
+    size: int,
+    seasons: List[str],
+    sort_key: Callable[[Dict[str, Any]], Any],
+    reverse: bool = False
+) -> Dict[str, Any]:
+    """Aplica paginação a uma query executada em várias épocas.
+    
+    Cada época devolve apenas as primeiras `offset + size` linhas (já ordenadas pela
+    query); os resultados são juntos com `sort_key`, que deve reproduzir o ORDER BY.
+    `params` pode ser comum a todas as épocas ou um dicionário época -> parâmetros.
+    """
+    if len(seasons) == 1:
+        season_params = params[seasons[0]] if isinstance(params, dict) else params
+        return paginate_query(base_query, season_params, page, size, seasons[0])
+    
+    size = min(size, 100)  # Máximo 100 items por página
+    offset = (page - 1) * size
+    
+    count_query = f"SELECT COUNT(*) as total FROM ({base_query})"
+    total = sum(row['total'] for row in execute_query_seasons(count_query, params, seasons))
+    
+    rows = execute_query_seasons(f"{base_query} LIMIT {offset + size}", params, seasons)
+    rows.sort(key=sort_key, reverse=reverse)
+    
+    return {
+        "data": rows[offset:offset + size],
+        "total": total,
+        "page": page,
+        "size": size,
+        "total_pages": math.ceil(total / size) if total > 0 else 0
+    }
+
 def build_where_clause(filters: Dict[str, Any]) -> tuple:
     """Constrói uma cláusula WHERE com base nos filtros fornecidos"""
     conditions = []
@@ -0,0 +1,87 @@
+"""
+Benchmark da latência das tools MCP: loopback HTTP (FastApiMCP) vs. execução direta.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.mcp_tool_calls [--iterations 200] [--concurrency 20]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi_mcp import FastApiMCP
+
+from app.main import app, mcp as in_process_mcp
+
+# Tools representativas (nome da tool, argumentos)
+TOOL_CALLS = [
+    ("health_check", {}),
+    ("get_leagues_api_v1_leagues__get", {}),
+    ("get_league_standings_api_v1_leagues__league_id__standings_get", {"league_id": 1}),
+    ("get_teams_api_v1_teams__get", {"search": "man"}),
+    ("get_team_statistics_api_v1_teams__team_id__statistics_get", {"team_id": 1}),
+    ("get_matches_api_v1_matches__get", {"league_id": 1, "size": 50}),
+]
+
+
+async def _call(server: FastApiMCP, name: str, arguments: dict):
+    return await server._execute_api_tool(
+        client=server._http_client,
+        tool_name=name,
+        arguments=arguments,
+        operation_map=server.operation_map,
+    )
+
+
+async def _sequential(server: FastApiMCP, name: str, arguments: dict, iterations: int) -> list:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await _call(server, name, arguments)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+async def _concurrent(server: FastApiMCP, concurrency: int, rounds: int) -> float:
+    calls = [TOOL_CALLS[i % len(TOOL_CALLS)] for i in range(concurrency)]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await asyncio.gather(*(_call(server, name, args) for name, args in calls))
+    return (time.perf_counter() - start) * 1000
+
+
+async def main(iterations: int, concurrency: int):
+    http_mcp = FastApiMCP(app, name="Football Data MCP (HTTP loopback)")
+
+    # Garantir que ambos os caminhos devolvem o mesmo resultado
+    for name, arguments in TOOL_CALLS:
+        if name == "health_check":
+            continue
+        expected = await _call(http_mcp, name, arguments)
+        actual = await _call(in_process_mcp, name, arguments)
+        assert expected[0].text == actual[0].text, f"Resultados diferentes em {name}"
+
+    print(f"{'tool':<66} {'http (ms)':>10} {'direto (ms)':>12} {'speedup':>8}")
+    for name, arguments in TOOL_CALLS:
+        http_times = await _sequential(http_mcp, name, arguments, iterations)
+        direct_times = await _sequential(in_process_mcp, name, arguments, iterations)
+        http_median = statistics.median(http_times)
+        direct_median = statistics.median(direct_times)
+        print(f"{name:<66} {http_median:>10.3f} {direct_median:>12.3f} {http_median / direct_median:>7.2f}x")
+
+    rounds = max(1, iterations // 10)
+    http_total = await _concurrent(http_mcp, concurrency, rounds)
+    direct_total = await _concurrent(in_process_mcp, concurrency, rounds)
+    print(
+        f"\n{rounds} rondas de {concurrency} chamadas concorrentes: "
+        f"http {http_total:.1f} ms, direto {direct_total:.1f} ms "
+        f"({http_total / direct_total:.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations, args.concurrency))
@@ -0,0 +1,42 @@
+import os
+import shutil
+
+import pytest
+
+from app import match_calendar, squad_stats
+from app.config import settings
+from app.database import reload_shards
+
+DATABASE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "sports_league.sqlite")
+SEASON = "2023-2024"
+
+
+def _reset_caches():
+    # Os índices são guardados por (época, versão dos dados), que se repetem entre cópias
+    match_calendar._calendars.clear()
+    squad_stats._stats.clear()
+
+
+@pytest.fixture
+def seasons_dir(tmp_path, monkeypatch):
+    """Pasta de épocas temporária; `add(season)` copia a base de dados como nova época"""
+    monkeypatch.setattr(settings, "SEASONS_DIR", str(tmp_path))
+
+    def add(season=SEASON):
+        path = tmp_path / f"{season}.sqlite"
+        shutil.copy(DATABASE, path)
+        reload_shards()
+        return path
+
+    add.path = tmp_path
+    _reset_caches()
+    yield add
+    monkeypatch.undo()
+    reload_shards()
+    _reset_caches()
+
+
+@pytest.fixture
+def shard_path(seasons_dir):
+    """Cópia da base de dados numa pasta de épocas temporária"""
+    return seasons_dir()
@@ -0,0 +1,90 @@
+import sqlite3
+
+from app.ingest import ingest
+from tests.conftest import SEASON
+
+EVERTON, FOREST, SHEFFIELD = 62, 351, 356
+
+
+def _standings(path):
+    with sqlite3.connect(path) as conn:
+        rows = conn.execute("SELECT * FROM standings ORDER BY league_id, position").fetchall()
+    return {(row[2], row[4]): row for row in rows}
+
+
+def _score(path, match_id):
+    with sqlite3.connect(path) as conn:
+        conn.row_factory = sqlite3.Row
+        return dict(conn.execute("SELECT * FROM scores WHERE match_id = ?", (match_id,)).fetchone())
+
+
+def test_reingest_existing_results_keeps_standings(shard_path):
+    """Voltar a ingerir resultados já conhecidos não altera a classificação (pontos retirados, desempates)"""
+    before = _standings(shard_path)
+
+    # Everton (com pontos retirados) e o último jogo da Serie A (desempates por confronto direto)
+    ingest(SEASON, scores=[_score(shard_path, 436305), _score(shard_path, 444534)])
+
+    assert _standings(shard_path) == before
+
+
+def test_new_result_is_applied_as_delta(shard_path):
+    before = _standings(shard_path)
+
+    summary = ingest(
+        SEASON,
+        matches=[{
+            "match_id": 900001, "season_id": 1, "league_id": 1, "matchday": 39,
+            "home_team_id": EVERTON, "away_team_id": SHEFFIELD, "utc_date": "2024-05-25",
+        }],
+        scores=[{"score_id": 900001, "match_id": 900001, "full_time_home": 2, "full_time_away": 0}],
+    )
+    after = _standings(shard_path)
+
+    assert summary["standings_recomputed"] == [1]
+
+    # Everton: 40 pontos guardados (já com a dedução) + 3
+    everton_before, everton_after = before[(1, EVERTON)], after[(1, EVERTON)]
+    assert everton_after[3] == everton_before[3] == 15
+    assert everton_after[5:10] == (39, everton_before[6] + 1, everton_before[7], everton_before[8], 43)
+    assert everton_after[10:13] == (everton_before[10] + 2, everton_before[11], everton_before[12] + 2)
+    assert everton_after[13] == '["W", "D", "W", "L", "W"]'
+
+    sheffield_before, sheffield_after = before[(1, SHEFFIELD)], after[(1, SHEFFIELD)]
+    assert sheffield_after[5:10] == (39, sheffield_before[6], sheffield_before[7], sheffield_before[8] + 1, 16)
+
+    # Restantes equipas (incluindo o Nottingham Forest, também com dedução) ficam iguais
+    untouched = {key for key in before if key[1] not in (EVERTON, SHEFFIELD)}
+    assert before[(1, FOREST)][9] == 32
+    assert {key: after[key] for key in untouched} == {key: before[key] for key in untouched}
+
+
+def test_partial_records_keep_omitted_columns(shard_path):
+    """Um resultado só com o marcador final não apaga o resultado ao intervalo guardado"""
+    before = _score(shard_path, 436313)
+    assert (before["half_time_home"], before["half_time_away"]) == (1, 1)
+
+    ingest(SEASON, scores=[{"score_id": before["score_id"], "match_id": 436313, "full_time_home": 3, "full_time_away": 1}])
+
+    after = _score(shard_path, 436313)
+    assert after == {**before, "full_time_home": 3, "full_time_away": 1}
+    with sqlite3.connect(shard_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM scores WHERE match_id = 436313").fetchone()[0] == 1
+        assert conn.execute("SELECT winner FROM matches WHERE match_id = 436313").fetchone()[0] == "HOME_TEAM"
+
+
+def test_partial_match_update_and_new_rows(shard_path):
+    """Colunas omitidas de um jogo mantêm-se; registos novos ficam com NULL nas colunas em falta"""
+    with sqlite3.connect(shard_path) as conn:
+        stored = conn.execute("SELECT * FROM matches WHERE match_id = 436305").fetchone()
+
+    ingest(SEASON, matches=[
+        {"match_id": 436305, "utc_date": "2024-05-12"},
+        {"match_id": 900002, "league_id": 1, "home_team_id": EVERTON, "away_team_id": FOREST},
+    ])
+
+    with sqlite3.connect(shard_path) as conn:
+        assert conn.execute("SELECT * FROM matches WHERE match_id = 436305").fetchone() == stored[:-1] + ("2024-05-12",)
+        assert conn.execute("SELECT * FROM matches WHERE match_id = 900002").fetchone() == (
+            900002, None, 1, None, EVERTON, FOREST, None, None
+        )
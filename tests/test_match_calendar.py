@@ -0,0 +1,88 @@
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.match_calendar import MatchCalendar
+
+ROWS = [
+    {"match_id": 1, "league_id": 1, "utc_date": "2024-05-01"},
+    {"match_id": 2, "league_id": 2, "utc_date": "2024-05-01"},
+    {"match_id": 3, "league_id": 1, "utc_date": "2024-05-03"},
+    {"match_id": 4, "league_id": 1, "utc_date": "2024-05-10"},
+    {"match_id": 5, "league_id": 2, "utc_date": "2024-05-10"},
+    {"match_id": 6, "league_id": 2, "utc_date": "2024-05-20"},
+]
+
+
+@pytest.fixture
+def calendar():
+    return MatchCalendar("2023-2024", 0, ROWS)
+
+
+def _ids(rows):
+    return [row["match_id"] for row in rows]
+
+
+@pytest.mark.parametrize("start, end, league_id, expected", [
+    (date(2024, 5, 1), date(2024, 5, 1), None, [1, 2]),      # início e fim inclusivos
+    (date(2024, 5, 2), date(2024, 5, 9), None, [3]),         # limites sem jogos
+    (date(2024, 5, 10), date(2024, 5, 20), None, [4, 5, 6]),
+    (None, date(2024, 5, 3), None, [1, 2, 3]),
+    (date(2024, 5, 10), None, None, [4, 5, 6]),
+    (date(2024, 5, 1), date(2024, 5, 20), 2, [2, 5, 6]),
+    (date(2024, 4, 1), date(2024, 4, 30), None, []),         # antes do primeiro jogo
+    (date(2024, 5, 21), date(2024, 6, 30), None, []),        # depois do último jogo
+    (date(2024, 5, 1), date(2024, 5, 20), 99, []),           # liga sem jogos
+])
+def test_range_boundaries(calendar, start, end, league_id, expected):
+    assert _ids(calendar.range(start, end, league_id)) == expected
+
+
+def test_last_match_days(calendar):
+    assert calendar.last_match_days(1) == (date(2024, 5, 20), date(2024, 5, 20))
+    assert calendar.last_match_days(2) == (date(2024, 5, 10), date(2024, 5, 20))
+    assert calendar.last_match_days(10) == (date(2024, 5, 1), date(2024, 5, 20))
+    assert calendar.last_match_days(2, league_id=1) == (date(2024, 5, 3), date(2024, 5, 10))
+    assert calendar.last_match_days(3, league_id=99) == (None, None)
+
+
+@pytest.fixture
+def client(shard_path):
+    return TestClient(app)
+
+
+def _upcoming(client, **params):
+    return client.get("/api/v1/matches/upcoming/", params=params)
+
+
+def test_upcoming_to_only_window(client):
+    """Só com 'to' devolve os `days` dias que terminam nessa data"""
+    response = _upcoming(client, to="2024-05-01", days=3)
+    assert response.status_code == 200
+    days = {m["utc_date"][:10] for m in response.json()}
+    assert days and all("2024-04-29" <= day <= "2024-05-01" for day in days)
+
+
+def test_upcoming_rejects_long_explicit_range(client):
+    response = _upcoming(client, **{"from": "2000-01-01", "to": "2030-06-30"})
+    assert response.status_code == 400
+    assert "'from' e 'to'" in response.json()["detail"]
+    assert _upcoming(client, **{"from": "2024-01-01", "to": "2024-01-30"}).status_code == 200
+    assert _upcoming(client, as_of="2024-01-01", to="2024-01-31").status_code == 400
+
+
+def test_upcoming_inverted_range_names_parameters(client):
+    response = _upcoming(client, as_of="2024-05-10", to="2024-05-01")
+    assert response.status_code == 400
+    assert "'as_of' posterior a 'to'" in response.json()["detail"]
+
+
+def test_upcoming_historical_season_uses_last_match_days(client):
+    """Sem jogos depois de hoje, mostra os últimos `days` dias com jogos da época"""
+    matches = _upcoming(client, days=7).json()
+    days = sorted({m["utc_date"][:10] for m in matches})
+    assert len(days) == 7
+    assert days[-1] == "2024-06-02"
+    assert len(_upcoming(client, days=7, league_id=2).json()) > 1
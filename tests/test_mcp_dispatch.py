@@ -0,0 +1,102 @@
+import asyncio
+import json
+import time
+
+import pytest
+from fastapi_mcp import FastApiMCP
+
+from app.main import app, mcp as in_process_mcp
+from app.mcp_dispatch import INTERNAL_ERROR_DETAIL
+from app.routers import leagues
+
+LEAGUE = "get_league_api_v1_leagues__league_id__get"
+STANDINGS = "get_league_standings_api_v1_leagues__league_id__standings_get"
+TEAMS = "get_teams_api_v1_teams__get"
+MATCHES = "get_matches_api_v1_matches__get"
+
+
+@pytest.fixture
+def http_mcp():
+    return FastApiMCP(app, name="Football Data MCP (HTTP loopback)")
+
+
+def _call(server, name, arguments):
+    async def call():
+        return await server._execute_api_tool(
+            client=server._http_client,
+            tool_name=name,
+            arguments=arguments,
+            operation_map=server.operation_map,
+        )
+    return asyncio.run(call())
+
+
+def _error(server, name, arguments):
+    with pytest.raises(Exception) as exc_info:
+        _call(server, name, arguments)
+    return str(exc_info.value)
+
+
+@pytest.mark.parametrize("name, arguments", [
+    (STANDINGS, {"league_id": 1}),
+    (TEAMS, {"search": "man"}),
+    (MATCHES, {"from": "2024-05-01", "to": "2024-05-05", "league_id": 2, "size": 50}),
+])
+def test_in_process_matches_http(shard_path, http_mcp, name, arguments):
+    """Parâmetros de path, de query e com alias ('from') dão o mesmo resultado nos dois caminhos"""
+    expected = _call(http_mcp, name, arguments)
+    actual = _call(in_process_mcp, name, arguments)
+    assert actual[0].text == expected[0].text
+    if name == MATCHES:
+        data = json.loads(actual[0].text)["data"]
+        assert data and all("2024-05-01" <= m["utc_date"][:10] <= "2024-05-05" for m in data)
+
+
+def test_not_found_is_mapped_to_404(shard_path, http_mcp):
+    for server in (http_mcp, in_process_mcp):
+        message = _error(server, LEAGUE, {"league_id": 999999})
+        assert "Status code: 404" in message
+        assert "Liga não encontrada" in message
+
+
+def test_invalid_arguments_are_mapped_to_422(shard_path, http_mcp):
+    for server in (http_mcp, in_process_mcp):
+        message = _error(server, LEAGUE, {"league_id": "abc"})
+        assert "Status code: 422" in message
+        assert "league_id" in message
+
+
+def test_unexpected_error_is_sanitized(shard_path, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("no such table: /srv/data/secret.sqlite")
+
+    monkeypatch.setattr(leagues, "execute_single_query", fail)
+    message = _error(in_process_mcp, LEAGUE, {"league_id": 1})
+    assert "Status code: 500" in message
+    assert INTERNAL_ERROR_DETAIL in message
+    assert "secret" not in message
+
+
+def test_blocking_handlers_run_concurrently(shard_path, monkeypatch):
+    """Handlers com acesso bloqueante correm no threadpool e não serializam as tools"""
+    def slow_query(*args, **kwargs):
+        time.sleep(0.2)
+        return {"league_id": 1, "name": "Premier League", "country": "England"}
+
+    monkeypatch.setattr(leagues, "execute_single_query", slow_query)
+
+    async def gather():
+        return await asyncio.gather(*(
+            in_process_mcp._execute_api_tool(
+                client=in_process_mcp._http_client,
+                tool_name=LEAGUE,
+                arguments={"league_id": 1},
+                operation_map=in_process_mcp.operation_map,
+            )
+            for _ in range(5)
+        ))
+
+    start = time.perf_counter()
+    results = asyncio.run(gather())
+    assert len(results) == 5
+    assert time.perf_counter() - start < 0.6
@@ -0,0 +1,87 @@
+import pytest
+
+from app import memory
+from app.database import Shard, get_shards, reload_shards
+from app.memory import ByteLRUCache, budget
+
+
+@pytest.fixture
+def isolated_budget(monkeypatch):
+    """Orçamento só com as caches criadas no teste"""
+    monkeypatch.setattr(budget, "_caches", [])
+    monkeypatch.setattr(budget, "max_bytes", 1000)
+    return budget
+
+
+def test_cache_evicts_least_recently_used_over_its_limit(isolated_budget):
+    cache = ByteLRUCache("test", 100)
+    for key in ("a", "b", "c"):
+        cache.put(key, key, size=40)
+
+    assert cache.get("a") is None
+    assert cache.current_bytes == 80 and cache.evictions == 1
+
+    # "b" passa a ser o mais recente; "c" é o próximo a sair
+    assert cache.get("b") == "b"
+    cache.put("d", "d", size=40)
+    assert cache.get("c") is None
+    assert cache.get("b") == "b" and cache.get("d") == "d"
+
+
+def test_replacing_an_entry_updates_its_size(isolated_budget):
+    cache = ByteLRUCache("test", 100)
+    cache.put("a", "a", size=40)
+    cache.put("a", "a2", size=10)
+    assert cache.current_bytes == 10 and len(cache) == 1
+
+
+def test_entries_larger_than_the_limit_are_not_stored(isolated_budget):
+    cache = ByteLRUCache("test", 100)
+    cache.put("a", "a", size=40)
+    cache.put("big", "big", size=101)
+    assert cache.get("big") is None
+    assert cache.get("a") == "a" and cache.current_bytes == 40
+
+    # Nem entradas maiores que o orçamento global
+    isolated_budget.max_bytes = 50
+    large = ByteLRUCache("large", 1000)
+    large.put("x", "x", size=60)
+    assert len(large) == 0
+
+
+def test_budget_evicts_from_the_largest_cache(isolated_budget):
+    isolated_budget.max_bytes = 100
+    large, small = ByteLRUCache("large", 1000), ByteLRUCache("small", 1000)
+    large.put("l1", 1, size=35)
+    large.put("l2", 2, size=35)
+    small.put("s1", 1, size=20)
+
+    small.put("s2", 2, size=20)
+
+    assert isolated_budget.used_bytes == 75
+    assert large.get("l1") is None and large.get("l2") == 2
+    assert small.get("s1") == 1 and small.get("s2") == 2
+    assert [c["name"] for c in isolated_budget.stats()["caches"]] == ["small", "large"]
+
+
+def test_estimate_size_counts_nested_objects():
+    rows = [{"name": "x" * 1000}]
+    assert memory.estimate_size(rows) > 1000
+
+
+def test_shard_close_unregisters_its_cache(isolated_budget, shard_path):
+    isolated_budget.max_bytes = 10 * memory.MB
+    shard = Shard("test", str(shard_path))
+    shard.query("SELECT * FROM leagues")
+    assert shard._cache in isolated_budget._caches and shard._cache.current_bytes > 0
+
+    shard.close()
+    assert shard._cache not in isolated_budget._caches
+    assert shard._cache.current_bytes == 0
+
+
+def test_reload_shards_releases_previous_caches(shard_path):
+    old_caches = [shard._cache for shard in get_shards().values()]
+    reload_shards()
+    assert old_caches and not any(cache in budget._caches for cache in old_caches)
+    assert all(shard._cache in budget._caches for shard in get_shards().values())
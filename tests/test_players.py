@@ -0,0 +1,57 @@
+import sqlite3
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.squad_stats import age_on
+
+OLD_SEASON, SEASON = "2022-2023", "2023-2024"
+EVERTON = 62
+
+
+@pytest.fixture
+def client(seasons_dir):
+    """Duas épocas: a mais antiga com os jogos um ano antes (mesmos jogadores)"""
+    with sqlite3.connect(seasons_dir(OLD_SEASON)) as conn:
+        conn.execute("UPDATE matches SET utc_date = date(utc_date, '-1 year')")
+    seasons_dir(SEASON)
+    return TestClient(app)
+
+
+def _players(client, **params):
+    response = client.get("/api/v1/players/", params={"size": 100, **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_ages_are_measured_at_the_end_of_the_season(client):
+    team = client.get(f"/api/v1/players/analytics/teams/{EVERTON}", params={"season": SEASON}).json()
+    old_team = client.get(f"/api/v1/players/analytics/teams/{EVERTON}", params={"season": OLD_SEASON}).json()
+    assert team["age_reference_date"] == "2024-06-02"
+    assert old_team["age_reference_date"] == "2023-06-02"
+    assert old_team["average_age"] == pytest.approx(team["average_age"] - 1, abs=0.1)
+
+    player = _players(client, season=SEASON, team_id=EVERTON)["data"][0]
+    detail = client.get(f"/api/v1/players/{player['player_id']}", params={"season": OLD_SEASON}).json()
+    assert player["age"] == age_on(player["date_of_birth"], date(2024, 6, 2))
+    assert detail["age"] == age_on(player["date_of_birth"], date(2023, 6, 2))
+    assert detail["age_reference_date"] == "2023-06-02"
+
+
+def test_age_filter_uses_each_season_reference(client):
+    result = _players(client, season=f"{OLD_SEASON},{SEASON}", min_age=30, max_age=30)
+    per_season = {s: _players(client, season=s, min_age=30, max_age=30)["total"] for s in (OLD_SEASON, SEASON)}
+    assert result["total"] == sum(per_season.values())
+
+    references = {OLD_SEASON: date(2023, 6, 2), SEASON: date(2024, 6, 2)}
+    for page in range(1, result["total_pages"] + 1):
+        for player in _players(client, season=f"{OLD_SEASON},{SEASON}", min_age=30, max_age=30, page=page)["data"]:
+            assert player["age"] == 30
+            assert age_on(player["date_of_birth"], references[player["season"]]) == 30
+
+
+def test_age_range_must_not_be_inverted(client):
+    response = client.get("/api/v1/players/", params={"min_age": 30, "max_age": 20})
+    assert response.status_code == 400
@@ -0,0 +1,87 @@
+import sqlite3
+
+import pytest
+from fastapi import HTTPException
+
+from app.utils import paginate_query_seasons, resolve_seasons
+
+OLD_SEASON, SEASON = "2022-2023", "2023-2024"
+
+MATCHES_QUERY = "SELECT match_id, utc_date FROM matches WHERE league_id = ? ORDER BY utc_date DESC, match_id"
+PLAYERS_QUERY = "SELECT player_id, name FROM players WHERE nationality = ? ORDER BY name, player_id"
+
+
+@pytest.fixture
+def two_seasons(seasons_dir):
+    """Duas épocas copiadas; a mais antiga com datas deslocadas e menos jogadores, para os resultados se intercalarem"""
+    old_path = seasons_dir(OLD_SEASON)
+    with sqlite3.connect(old_path) as conn:
+        conn.execute("UPDATE matches SET utc_date = date(utc_date, '-45 days')")
+        conn.execute("DELETE FROM players WHERE player_id % 3 = 0")
+    seasons_dir(SEASON)
+    return [OLD_SEASON, SEASON]
+
+
+def _pages(query, params, seasons, size, sort_key, reverse=False):
+    first = paginate_query_seasons(query, params, 1, size, seasons, sort_key=sort_key, reverse=reverse)
+    pages = [first] + [
+        paginate_query_seasons(query, params, page, size, seasons, sort_key=sort_key, reverse=reverse)
+        for page in range(2, first["total_pages"] + 1)
+    ]
+    return first["total"], [row for page in pages for row in page["data"]]
+
+
+def test_resolve_seasons_deduplicates(two_seasons):
+    assert resolve_seasons(f"{SEASON},{SEASON}, {OLD_SEASON}") == [SEASON, OLD_SEASON]
+
+
+@pytest.mark.parametrize("season", [",", " , "])
+def test_resolve_seasons_rejects_empty_list(two_seasons, season):
+    with pytest.raises(HTTPException) as exc_info:
+        resolve_seasons(season)
+    assert exc_info.value.status_code == 400
+
+
+def test_resolve_seasons_unknown_season(two_seasons):
+    with pytest.raises(HTTPException) as exc_info:
+        resolve_seasons("1999-2000")
+    assert exc_info.value.status_code == 404
+
+
+def test_paginate_seasons_merges_descending_order(two_seasons):
+    """Páginas de 7 jogos em duas épocas seguem o ORDER BY e cobrem todas as linhas uma vez"""
+    total, rows = _pages(
+        MATCHES_QUERY, (2,), two_seasons, 7,
+        sort_key=lambda m: (m["utc_date"] or "", -m["match_id"]), reverse=True
+    )
+    keys = [(m["utc_date"], -m["match_id"]) for m in rows]
+    assert keys == sorted(keys, reverse=True)
+    assert total == len(rows) == 2 * 380
+    assert len({(m["season"], m["match_id"]) for m in rows}) == total
+    # As épocas intercalam-se (datas deslocadas), não ficam em blocos
+    switches = sum(1 for a, b in zip(rows, rows[1:]) if a["season"] != b["season"])
+    assert switches > 10
+
+
+def test_paginate_seasons_matches_single_query(seasons_dir, two_seasons):
+    """Cada página é igual à fatia correspondente de todas as linhas ordenadas"""
+    sort_key = lambda p: (p["name"] or "", p["player_id"])
+    expected = []
+    for season in two_seasons:
+        with sqlite3.connect(seasons_dir.path / f"{season}.sqlite") as conn:
+            expected += [
+                {"player_id": player_id, "name": name, "season": season}
+                for player_id, name in conn.execute(PLAYERS_QUERY, ("Portugal",))
+            ]
+    expected.sort(key=sort_key)
+
+    total, rows = _pages(PLAYERS_QUERY, ("Portugal",), two_seasons, 10, sort_key=sort_key)
+    assert total == len(expected)
+    assert rows == expected
+
+
+def test_paginate_single_season_has_no_season_column(two_seasons):
+    result = paginate_query_seasons(MATCHES_QUERY, (2,), 2, 5, [SEASON], sort_key=lambda m: m["utc_date"])
+    assert result["total"] == 380
+    assert result["page"] == 2 and len(result["data"]) == 5
+    assert "season" not in result["data"][0]